@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Model backends for the AI Ping-Pong 9-step pipeline.
+Lets each step call a real model endpoint (e.g. /api/generate in api-server-v4.cjs)
+through a shared keep-alive connection pool, or an in-process stub for offline runs.
+"""
+
+import http.client
+import json
+import queue
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+DEFAULT_API_BASE = "http://localhost:3002"
+
+
+class BackendError(Exception):
+    """A model call failed and should not be retried."""
+
+
+class RetryableBackendError(BackendError):
+    """A model call failed in a way that may succeed on retry (network error, 429, 5xx)."""
+
+
+class HTTPConnectionPool:
+    """
+    Thread-safe pool of keep-alive http.client connections to one host.
+    Idle connections are reused LIFO; a connection that errors is dropped.
+    """
+
+    def __init__(self, base_url: str, maxsize: int = 16, timeout: float = 120.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize)
+        self.created = 0
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        connection_class = (http.client.HTTPSConnection if self.scheme == "https"
+                            else http.client.HTTPConnection)
+        with self._lock:
+            self.created += 1
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """
+        Sends one request on a pooled connection and returns (status, body).
+        An idle connection the server has closed since its last use fails on
+        send or read; the request is then resent once, right away, on a new
+        connection, so stale sockets don't cost the caller a retry and backoff.
+        """
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            return self._send(self._new_connection(), method, path, body, headers)
+
+        try:
+            return self._send(connection, method, path, body, headers)
+        except RetryableBackendError as e:
+            # A timeout means a slow server, not a stale socket; leave it to the caller's retries.
+            if isinstance(e.__cause__, TimeoutError):
+                raise
+            return self._send(self._new_connection(), method, path, body, headers)
+
+    def _send(self, connection: http.client.HTTPConnection, method: str, path: str,
+              body: Optional[bytes], headers: Optional[Dict[str, str]]) -> Tuple[int, bytes]:
+        try:
+            connection.request(method, self.base_path + path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise RetryableBackendError(f"{type(e).__name__}: {e}") from e
+
+        if response.will_close:
+            connection.close()
+        else:
+            try:
+                self._idle.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+        return response.status, payload
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools: Dict[str, HTTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def shared_pool(base_url: str, maxsize: int = 16, timeout: float = 120.0) -> HTTPConnectionPool:
+    """One connection pool per base URL, shared by every backend that talks to it."""
+    with _pools_lock:
+        pool = _pools.get(base_url)
+        if pool is None:
+            pool = _pools[base_url] = HTTPConnectionPool(base_url, maxsize, timeout)
+        return pool
+
+
+class ModelBackend:
+    """
+    Base class for a model endpoint. Subclasses implement _generate (and
+    _generate_batch when supports_batch is True); this class adds the
+    per-backend concurrency limit and retry with exponential backoff.
+    """
+
+    supports_batch = False
+
+    def __init__(self, name: str, max_concurrency: int = 4, retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 8.0, max_batch_size: int = 16):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_batch_size = max_batch_size
+        self.calls = 0
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    # Semaphores can't be pickled; a process-pool worker gets its own limit.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_slots']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    @property
+    def cache_tag(self) -> str:
+        """Identifies the backend in step cache versions, so switching models invalidates entries."""
+        return f"{type(self).__name__}:{self.name}"
+
+    def generate(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        return self._with_retry(self._generate, prompt, context)
+
+    def generate_batch(self, prompts: List[str],
+                       contexts: Optional[List[Optional[Dict[str, Any]]]] = None) -> List[str]:
+        """Generates several prompts, using one request per chunk when the backend supports it."""
+        contexts = contexts or [None] * len(prompts)
+        if not self.supports_batch:
+            return [self.generate(prompt, context) for prompt, context in zip(prompts, contexts)]
+        results = []
+        for i in range(0, len(prompts), self.max_batch_size):
+            results.extend(self._with_retry(
+                self._generate_batch, prompts[i:i + self.max_batch_size],
+                contexts[i:i + self.max_batch_size]))
+        return results
+
+    def _with_retry(self, call: Callable[..., Any], *args) -> Any:
+        attempt = 0
+        while True:
+            try:
+                with self._slots:
+                    self.calls += 1
+                    return call(*args)
+            except RetryableBackendError:
+                if attempt >= self.retries:
+                    raise
+                delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+                time.sleep(delay * (0.5 + random.random() / 2))
+                attempt += 1
+
+    def _generate(self, prompt: str, context: Optional[Dict[str, Any]]) -> str:
+        raise NotImplementedError
+
+    def _generate_batch(self, prompts: List[str],
+                        contexts: List[Optional[Dict[str, Any]]]) -> List[str]:
+        raise NotImplementedError
+
+
+class APIServerBackend(ModelBackend):
+    """
+    Calls POST /api/generate on api-server-v4.cjs for one model (gpt, claude, gemini or grok).
+    The route sits behind requireAuth, so headers must carry the Cookie of a
+    signed-in session (the ai-ping-pong-session cookie); without it every call is a 401.
+    """
+
+    def __init__(self, model: str, base_url: str = DEFAULT_API_BASE,
+                 headers: Optional[Dict[str, str]] = None, use_search: bool = False,
+                 pool_size: int = 16, timeout: float = 120.0, **kwargs):
+        super().__init__(model, **kwargs)
+        self.base_url = base_url
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.use_search = use_search
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+    @property
+    def cache_tag(self) -> str:
+        search = "+search" if self.use_search else ""
+        return f"{super().cache_tag}{search}@{self.base_url}"
+
+    def _generate(self, prompt: str, context: Optional[Dict[str, Any]]) -> str:
+        body = json.dumps({
+            "model": self.name,
+            "prompt": prompt,
+            "context": context or {},
+            "useSearch": self.use_search
+        }).encode("utf-8")
+        pool = shared_pool(self.base_url, self.pool_size, self.timeout)
+        status, payload = pool.request("POST", "/api/generate", body, self.headers)
+        if status == 429 or status >= 500:
+            raise RetryableBackendError(f"{self.name}: HTTP {status}")
+        if status == 401:
+            raise BackendError(f"{self.name}: HTTP 401: /api/generate needs the Cookie of a signed-in session")
+        if status != 200:
+            raise BackendError(f"{self.name}: HTTP {status}: {payload[:200]!r}")
+        return json.loads(payload)["text"]
+
+
+class StubBackend(ModelBackend):
+    """
+    In-process stand-in for a model, for offline throughput tests. By default it
+    echoes context["draft"] so the pipeline output matches the simulation.
+    """
+
+    supports_batch = True
+
+    def __init__(self, name: str = "stub", latency: float = 0.0,
+                 respond: Optional[Callable[[str, Optional[Dict[str, Any]]], str]] = None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.latency = latency
+        self.respond = respond or _echo_draft
+        self.batches = 0
+
+    def _generate(self, prompt: str, context: Optional[Dict[str, Any]]) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.respond(prompt, context)
+
+    def _generate_batch(self, prompts: List[str],
+                        contexts: List[Optional[Dict[str, Any]]]) -> List[str]:
+        # One simulated round-trip for the whole batch.
+        self.batches += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [self.respond(prompt, context) for prompt, context in zip(prompts, contexts)]
+
+
+def _echo_draft(prompt: str, context: Optional[Dict[str, Any]]) -> str:
+    if context and "draft" in context:
+        return context["draft"]
+    return prompt
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle plus
+        # delayed ACKs add ~40ms to every keep-alive round-trip.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        if self.path.rstrip("/").endswith("/api/generate"):
+            if self.server.cookie is not None and self.headers.get("Cookie") != self.server.cookie:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._reply(401, {"error": "Authentication required"})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            self._reply(200, {"text": _echo_draft(request.get("prompt", ""), request.get("context"))})
+        else:
+            self._reply(404, {"error": "Not found"})
+
+    def _reply(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port: int = 0, latency: float = 0.0,
+                      keepalive_timeout: Optional[float] = None,
+                      cookie: Optional[str] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Starts a local keep-alive HTTP server mimicking /api/generate on a background
+    thread, so APIServerBackend can be exercised offline. keepalive_timeout closes
+    connections idle for that long, as Node does after 5 s; cookie, when set, is
+    required on every request, as requireAuth does. Returns (server, base_url);
+    call server.shutdown() when done.
+    """
+    handler = _StubHandler
+    if keepalive_timeout is not None:
+        handler = type("_StubHandler", (_StubHandler,), {"timeout": keepalive_timeout})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.cookie = cookie
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for AIPingPongExpertWorkflow.
+Runs generate_all_content/save_content over synthetic topic corpora and stores
+throughput, per-step latency, peak RSS and bytes written as JSON; --memory adds
+the bytes retained per generated piece.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from ai_ping_pong_cache import StepCache
+from ai_ping_pong_expert_workflow import AIPingPongExpertWorkflow, TopicExecutor
+from ai_ping_pong_models import ArgumentSections
+from ai_ping_pong_profiling import percentile
+
+
+CACHE_MODES = ("off", "cold", "warm")
+
+_DOMAINS = [
+    "Metaphysics & AI", "Psychology & Self-Help", "Digital Defense & Ethics",
+    "Gastronomy & Creativity", "Theology & Future of Belief", "Historiography & Archaeology",
+    "Corporate Strategy & Innovation", "Creative Writing & Entertainment",
+    "Finance & Economics", "Linguistics & Communication"
+]
+_SUBJECTS = [
+    "Model Committees", "Orchestrated Agents", "Feedback Loops", "Specialist Swarms",
+    "Human Orchestrators", "Emergent Strategy", "Cognitive Shields", "Generative Simulation"
+]
+_VERBS = ["Reinvent", "Disrupt", "Rescue", "Outthink", "Dismantle", "Rebuild"]
+
+
+def synthetic_topics(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Lazily yields `count` topics shaped like generate_tangential_topics() output."""
+    rng = random.Random(seed)
+    for topic_id in range(1, count + 1):
+        domain = rng.choice(_DOMAINS)
+        subject = rng.choice(_SUBJECTS)
+        verb = rng.choice(_VERBS)
+        yield {
+            "id": topic_id,
+            "title": f"{subject} #{topic_id}: Can AI Ping-Pong {verb} {domain.split(' & ')[0]}?",
+            "domain": domain,
+            "question": f"What happens when {subject.lower()} are applied to {domain.lower()}?",
+            "thesis": (
+                f"single-model thinking in {domain.lower()} has hit its ceiling. A committee of "
+                f"{subject.lower()}, each specialised and cross-checking the others, will {verb.lower()} "
+                f"the field in ways no monolithic approach can ({rng.randint(10, 99)}% better outcomes)."
+            )
+        }
+
+
+def _peak_rss_kb() -> int:
+    """Peak RSS of this process and its finished children (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _dir_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def _run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs one benchmark case; meant to execute in a fresh process so peak RSS is per case."""
+    work_dir = tempfile.mkdtemp(prefix="ai_ping_pong_bench_")
+    try:
+        step_cache = None
+        if case["cache"] != "off":
+            step_cache = StepCache(directory=os.path.join(work_dir, "cache"))
+        workflow = AIPingPongExpertWorkflow(step_cache=step_cache)
+        topics = list(synthetic_topics(case["size"], case["seed"]))
+
+        if case["cache"] == "warm":
+            workflow.generate_all_content(case["executor"], case["max_concurrency"], topics)
+
+        start = time.perf_counter()
+        content = workflow.generate_all_content(case["executor"], case["max_concurrency"], topics)
+        generated = time.perf_counter()
+        output_dir = os.path.join(work_dir, "output")
+        with contextlib.redirect_stdout(io.StringIO()):
+            workflow.save_content(content, output_dir)
+        saved = time.perf_counter()
+
+        step_latency = {}
+        pieces = content["opinion_pieces"].values()
+        for step in AIPingPongExpertWorkflow.STEP_VERSIONS:
+            timings = sorted(piece.step_timings[step] for piece in pieces)
+            step_latency[step] = {
+                "p50": percentile(timings, 50),
+                "p95": percentile(timings, 95),
+                "p99": percentile(timings, 99)
+            }
+
+        return {
+            **case,
+            "generate_seconds": generated - start,
+            "save_seconds": saved - generated,
+            "articles_per_sec": len(content["opinion_pieces"]) / (saved - start),
+            "failed": len(content["failed_topics"]),
+            "step_latency": step_latency,
+            "cache_stats": step_cache.stats() if step_cache else None,
+            "output_bytes": _dir_bytes(output_dir),
+            "peak_rss_kb": _peak_rss_kb()
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _dict_layout(content: Dict[str, Any]) -> Dict[str, Any]:
+    """The pre-model layout: topic dicts, and piece dicts that each embed their topic."""
+    topics = [topic.to_dict() for topic in content['topics']]
+    by_id = {topic['id']: topic for topic in topics}
+    pieces = {}
+    for piece_id, piece in content['opinion_pieces'].items():
+        record = piece.to_dict()
+        del record['topic_id'], record['profile_events'], record['cache_stats']
+        pieces[piece_id] = {'topic': by_id[piece.topic_id], **record}
+    return {**content, 'topics': topics, 'opinion_pieces': pieces}
+
+
+def measure_piece_memory(size: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Bytes still allocated per piece after generate_all_content, for the Topic/PieceResult
+    models and for the dict layout they replaced, measured with tracemalloc.
+    """
+    workflow = AIPingPongExpertWorkflow()
+    # Warm up so step versions and templates are not counted against the first layout.
+    workflow.generate_all_content(topics=synthetic_topics(2, seed))
+
+    def retained(layout) -> int:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            content = layout(workflow.generate_all_content(topics=synthetic_topics(size, seed)))
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del content
+        return current
+
+    models = retained(lambda content: content)
+    dicts = retained(_dict_layout)
+    sections = dict.fromkeys(ArgumentSections.__slots__, "")
+    return {
+        "size": size,
+        "models_bytes_per_piece": models / size,
+        "dicts_bytes_per_piece": dicts / size,
+        "saved_bytes_per_piece": (dicts - models) / size,
+        "argument_sections_bytes": sys.getsizeof(ArgumentSections(**sections)),
+        "argument_dict_bytes": sys.getsizeof(sections)
+    }
+
+
+def run_benchmarks(sizes: List[int], executors: List[str], cache_modes: List[str],
+                   max_concurrency: Optional[int] = None, seed: int = 0,
+                   isolate: bool = True) -> Dict[str, Any]:
+    """Runs every size x executor x cache combination and returns a JSON-serialisable report."""
+    cases = []
+    context = multiprocessing.get_context("spawn")
+    for size, executor, cache in itertools.product(sizes, executors, cache_modes):
+        case = {"size": size, "executor": executor, "cache": cache,
+                "max_concurrency": max_concurrency, "seed": seed}
+        print(f"⏱️  size={size} executor={executor} cache={cache}", flush=True)
+        if isolate:
+            # A fresh (non-daemonic) worker per case keeps peak RSS per case and lets
+            # the process executor start its own pool inside it.
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(_run_case, case).result()
+        else:
+            result = _run_case(case)
+        print(f"   {result['articles_per_sec']:,.0f} articles/sec, "
+              f"peak RSS {result['peak_rss_kb'] / 1024:,.1f} MB, "
+              f"{result['output_bytes']:,} bytes written", flush=True)
+        cases.append(result)
+
+    return {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "cases": cases
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    tolerance: float = 0.10) -> List[str]:
+    """Lists cases whose throughput dropped, or whose RSS/bytes/memory per piece grew, by more than tolerance."""
+    def key(case):
+        return (case["size"], case["executor"], case["cache"])
+
+    previous = {key(case): case for case in baseline["cases"]}
+    regressions = []
+    for case in current["cases"]:
+        old = previous.get(key(case))
+        if old is None:
+            continue
+        label = f"size={case['size']} executor={case['executor']} cache={case['cache']}"
+        if case["articles_per_sec"] < old["articles_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: throughput {old['articles_per_sec']:,.0f} -> {case['articles_per_sec']:,.0f} articles/sec")
+        for metric in ("peak_rss_kb", "output_bytes"):
+            if case[metric] > old[metric] * (1 + tolerance):
+                regressions.append(f"{label}: {metric} {old[metric]:,} -> {case[metric]:,}")
+
+    previous_memory = {entry["size"]: entry for entry in baseline.get("memory", [])}
+    for entry in current.get("memory", []):
+        old = previous_memory.get(entry["size"])
+        if old is not None and entry["models_bytes_per_piece"] > old["models_bytes_per_piece"] * (1 + tolerance):
+            regressions.append(
+                f"memory size={entry['size']}: {old['models_bytes_per_piece']:,.0f} -> "
+                f"{entry['models_bytes_per_piece']:,.0f} bytes/piece")
+    return regressions
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    parser = parser or argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000],
+                        help="synthetic corpus sizes (default: 10 1000)")
+    parser.add_argument("--executors", nargs="+", default=["sequential", "thread"],
+                        choices=TopicExecutor.BACKENDS)
+    parser.add_argument("--cache", nargs="+", default=["off"], choices=CACHE_MODES,
+                        help="step cache modes to compare (default: off)")
+    parser.add_argument("-j", "--max-concurrency", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="bench_results.json",
+                        help="where to write the JSON report")
+    parser.add_argument("--baseline", help="previous JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative regression vs the baseline (default: 0.10)")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="run cases in this process (peak RSS becomes cumulative)")
+    parser.add_argument("--memory", action="store_true",
+                        help="also measure bytes retained per piece (models vs dict records)")
+    return parser
+
+
+def run_from_args(args: argparse.Namespace) -> int:
+    report = run_benchmarks(args.sizes, args.executors, args.cache,
+                            args.max_concurrency, args.seed, not args.no_isolate)
+    if args.memory:
+        report["memory"] = []
+        for size in args.sizes:
+            entry = measure_piece_memory(size, args.seed)
+            print(f"🧠 size={size}: {entry['models_bytes_per_piece']:,.0f} bytes/piece "
+                  f"(dict records: {entry['dicts_bytes_per_piece']:,.0f})", flush=True)
+            report["memory"].append(entry)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📊 Benchmark report saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(json.load(f), report, args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+def main():
+    sys.exit(run_from_args(build_parser().parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for the AI Ping-Pong 9-step pipeline.
+Entries are keyed on the step name, the step version and the step inputs.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from ai_ping_pong_models import decode_model, encode_model
+
+
+def _stable_repr(const: Any) -> str:
+    """
+    repr() of a code constant with frozenset members sorted. Set literals compile
+    to frozensets whose order follows the per-process string hash seed.
+    """
+    if isinstance(const, frozenset):
+        return "frozenset({" + ", ".join(sorted(map(_stable_repr, const))) + "})"
+    if isinstance(const, tuple):
+        parts = [_stable_repr(item) for item in const]
+        return "(" + ", ".join(parts) + ("," if len(parts) == 1 else "") + ")"
+    return repr(const)
+
+
+def code_fingerprint(fn: Callable[..., Any]) -> str:
+    """Hashes a function's bytecode and constants so an edited step gets a new version."""
+    digest = hashlib.sha256()
+
+    def feed(code):
+        digest.update(code.co_code)
+        for const in code.co_consts:
+            if hasattr(const, 'co_code'):
+                feed(const)
+            else:
+                digest.update(_stable_repr(const).encode('utf-8'))
+        digest.update(repr(code.co_names).encode('utf-8'))
+
+    feed(getattr(fn, '__func__', fn).__code__)
+    return digest.hexdigest()[:16]
+
+
+def _key_default(value: Any) -> Any:
+    try:
+        return encode_model(value)
+    except TypeError:
+        return str(value)
+
+
+def make_key(step_name: str, version: str, inputs: Sequence[Any]) -> str:
+    """Content address of one step call."""
+    payload = json.dumps([step_name, version, list(inputs)], sort_keys=True,
+                         ensure_ascii=False, default=_key_default)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class StepCache:
+    """
+    In-memory LRU with an optional on-disk store.
+
+    max_entries bounds the memory tier. When directory is set, entries are also
+    written there as JSON files; ttl (seconds) expires entries in both tiers and
+    max_disk_bytes evicts the oldest files once the store grows past it.
+
+    A copy pickled into a worker process is "detached": it starts with an empty
+    memory tier that then lives as long as the worker, and its counters are
+    drained into each piece and absorbed by the parent's cache.
+    """
+
+    def __init__(self, max_entries: int = 4096, directory: Optional[str] = None,
+                 ttl: Optional[float] = None, max_disk_bytes: Optional[int] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.directory = directory
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+        self._disk_bytes = 0
+        self._drained_disk_bytes = 0
+        self.detached = False
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    # Locks can't be pickled, and a worker's memory tier and counters start empty.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_memory'] = OrderedDict()
+        state['_stats'] = dict.fromkeys(self._stats, 0)
+        state['_drained_disk_bytes'] = self._disk_bytes
+        state['detached'] = True
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def call(self, step_name: str, version: str, fn: Callable[..., Any], *args) -> Any:
+        """Returns the cached result of fn(*args), computing and storing it on a miss."""
+        key = make_key(step_name, version, args)
+        found, value = self.get(key)
+        if found:
+            return value
+        value = fn(*args)
+        self.put(key, value)
+        return value
+
+    def get(self, key: str):
+        """Returns (found, value). Values are copied so callers may mutate them."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if self._expired(created, now):
+                    del self._memory[key]
+                    self._stats['expired'] += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return True, copy.deepcopy(value)
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    record = json.load(f, object_hook=decode_model)
+            except (OSError, ValueError):
+                record = None
+            if record is not None:
+                if self._expired(record['created'], now):
+                    self._remove_file(path)
+                    with self._lock:
+                        self._stats['expired'] += 1
+                else:
+                    with self._lock:
+                        self._stats['disk_hits'] += 1
+                        self._remember(key, record['created'], record['value'])
+                    return True, copy.deepcopy(record['value'])
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return False, None
+
+    def put(self, key: str, value: Any):
+        created = time.time()
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, created, value)
+        if self.directory:
+            self._write_file(key, {'created': created, 'value': value})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        stats['disk_bytes'] = self._disk_bytes
+        return stats
+
+    def drain_stats(self) -> Dict[str, int]:
+        """Counters since the last drain, including disk growth; a detached cache ships these back."""
+        with self._lock:
+            stats = dict(self._stats)
+            self._stats = dict.fromkeys(self._stats, 0)
+            stats['disk_bytes'] = self._disk_bytes - self._drained_disk_bytes
+            self._drained_disk_bytes = self._disk_bytes
+        return stats
+
+    def absorb_stats(self, stats: Dict[str, int]):
+        """Adds counters drained from a worker process's copy of this cache."""
+        with self._lock:
+            for name, count in stats.items():
+                if name == 'disk_bytes':
+                    self._disk_bytes += count
+                else:
+                    self._stats[name] += count
+
+    def clear(self):
+        """Drops every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for path, _, _ in self._disk_entries():
+                self._remove_file(path)
+
+    # --- Internal helpers ---
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, created: float, value: Any):
+        """Inserts into the LRU tier; caller holds the lock."""
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _write_file(self, key: str, record: Dict[str, Any]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, default=encode_model)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._disk_bytes += os.path.getsize(path) - previous
+        if self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _disk_entries(self):
+        """Yields (path, mtime, size) for every stored entry."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_mtime, st.st_size
+
+    def _evict_disk(self):
+        """Removes the oldest files until the store is back under max_disk_bytes."""
+        for path, _, _ in sorted(self._disk_entries(), key=lambda entry: entry[1]):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            self._remove_file(path)
+            with self._lock:
+                self._stats['evictions'] += 1
+
+    def _remove_file(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes -= size
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Lazy topic catalog for the AI Ping-Pong workflow.
+Streams topics from JSON, JSONL or numbered plain-text files (like topics.txt) and
+keeps a memory-mapped offset index for lookup by id and filtering by domain.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ai_ping_pong_models import Topic
+from ai_ping_pong_output import atomic_open
+
+
+FORMATS = ("jsonl", "json", "text")
+DEFAULT_DOMAIN = "General"
+
+# Numbered lines, as in topics.txt and process_topics.sh: "12. Topic text".
+_TEXT_LINE = re.compile(rb"^\s*(\d+)\.\s*(.*?)\s*$")
+# Tokens the JSON array scanner cares about; escapes are consumed whole.
+_JSON_TOKEN = re.compile(rb'\\.|["{}\[\]]', re.S)
+
+# Index record: topic id, byte offset and length in the source, domain number.
+_RECORD = struct.Struct("<qQII")
+_HEADER_SIZE = struct.Struct("<Q")
+# Domain postings are written from array("I"), so native byte order.
+_POSTING = struct.Struct("I")
+_INDEX_VERSION = 1
+
+
+def _fallback_index_path(index_path: str) -> str:
+    """Per-user cache location for the index of a source in a read-only directory."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+    name = hashlib.sha256(os.path.abspath(index_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_home, "ai_ping_pong", "indexes", name + ".idx")
+
+
+def infer_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".json":
+        return "json"
+    return "text"
+
+
+class TopicCatalog:
+    """
+    A topic file that is never loaded as a whole.
+
+    Iterating streams topics in file order with a single forward read. get(),
+    filter(), ids() and len() go through an on-disk index (`<path>.idx` unless
+    index_path says otherwise) that is built on first use, rebuilt when the
+    source changes, and memory-mapped, so lookups read only the records they need.
+    If the index can't be written there it goes under ~/.cache/ai_ping_pong, and
+    failing that it is kept in memory for the life of the catalog.
+    Topics are yielded as Topic objects; records missing a field are filled in
+    (domain from default_domain, title and thesis from each other).
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, index_path: Optional[str] = None,
+                 default_domain: str = DEFAULT_DOMAIN):
+        self.path = path
+        self.format = fmt or infer_format(path)
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown topic format '{self.format}'. Choose one of: {', '.join(FORMATS)}")
+        self.index_path = index_path or path + ".idx"
+        self.default_domain = default_domain
+        self._index: Optional["_TopicIndex"] = None
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Open handles stay behind when the catalog is pickled (e.g. to a process pool).
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_index'] = state['_fd'] = None
+        return state
+
+    def __iter__(self) -> Iterator[Topic]:
+        for _, _, topic in self._scan():
+            yield topic
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, topic_id: int) -> bool:
+        return self.index.position(topic_id) is not None
+
+    @property
+    def index(self) -> "_TopicIndex":
+        if self._index is None:
+            self._index = _TopicIndex.open_or_build(self)
+        return self._index
+
+    def get(self, topic_id: int) -> Topic:
+        """Random access by id; raises KeyError for unknown ids."""
+        position = self.index.position(topic_id)
+        if position is None:
+            raise KeyError(topic_id)
+        return self._read_record(position)
+
+    def ids(self, domain: Optional[str] = None) -> Iterator[int]:
+        """Topic ids in ascending order, optionally limited to one domain."""
+        for position in self.index.positions(domain):
+            yield self.index.record(position)[0]
+
+    def filter(self, domain: str) -> Iterator[Topic]:
+        """Topics of one domain, read straight from their offsets without a scan."""
+        for position in self.index.positions(domain):
+            yield self._read_record(position)
+
+    def slice(self, start: int = 0, stop: Optional[int] = None,
+              domain: Optional[str] = None) -> Iterator[Topic]:
+        """Topics at positions [start, stop) in id order, optionally within one domain."""
+        for position in self.index.positions(domain, start, stop):
+            yield self._read_record(position)
+
+    def domains(self) -> Dict[str, int]:
+        """Topic count per domain."""
+        return self.index.domain_counts()
+
+    def close(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    # --- Parsing ---
+
+    def _normalize(self, raw: Dict[str, Any], ordinal: int) -> Topic:
+        thesis = raw.get("thesis") or raw.get("title") or ""
+        return Topic(
+            id=int(raw.get("id", ordinal)),
+            title=raw.get("title") or thesis,
+            domain=raw.get("domain") or self.default_domain,
+            question=raw.get("question", ""),
+            thesis=thesis
+        )
+
+    def _parse(self, data: bytes, ordinal: int) -> Optional[Topic]:
+        if self.format == "text":
+            match = _TEXT_LINE.match(data)
+            if not match:
+                return None
+            text = match.group(2).decode("utf-8")
+            return self._normalize({"id": int(match.group(1)), "title": text, "thesis": text}, ordinal)
+        if not data.strip():
+            return None
+        return self._normalize(json.loads(data), ordinal)
+
+    def _scan(self) -> Iterator[Tuple[int, int, Topic]]:
+        """Yields (offset, length, topic) for every topic in file order."""
+        ordinal = 0
+        for offset, length, data in self._spans():
+            topic = self._parse(data, ordinal + 1)
+            if topic is not None:
+                ordinal += 1
+                yield offset, length, topic
+
+    def _spans(self) -> Iterator[Tuple[int, int, bytes]]:
+        if self.format != "json":
+            with open(self.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    yield offset, len(line), line
+                    offset += len(line)
+            return
+
+        # JSON arrays are scanned for top-level elements over an mmap, so the
+        # file is never decoded as a whole.
+        if os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            depth, in_string, start = 0, False, 0
+            for match in _JSON_TOKEN.finditer(mm):
+                token = match.group()
+                if in_string:
+                    if token == b'"':
+                        in_string = False
+                    continue
+                if token == b'"':
+                    in_string = True
+                elif token in (b"{", b"["):
+                    depth += 1
+                    if depth == 2:
+                        start = match.start()
+                elif token in (b"}", b"]"):
+                    if depth == 2:
+                        yield start, match.end() - start, mm[start:match.end()]
+                    depth -= 1
+
+    def _read_record(self, position: int) -> Topic:
+        _, offset, length, _ = self.index.record(position)
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        # pread doesn't move a shared file position, so lookups are safe across threads.
+        data = os.pread(self._fd, length, offset)
+        return self._parse(data, position + 1)
+
+
+class _TopicIndex:
+    """
+    On-disk index: an 8-byte header length, a JSON header, the fixed-size
+    records sorted by id, then one array of record positions per domain.
+    """
+
+    def __init__(self, source: Union[str, bytes]):
+        """source is the path of an index file, or the index itself when it is kept in memory."""
+        self._file = None
+        if isinstance(source, bytes):
+            self._mm = source
+        else:
+            self._file = open(source, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (header_size,) = _HEADER_SIZE.unpack_from(self._mm, 0)
+        self.header = json.loads(self._mm[_HEADER_SIZE.size:_HEADER_SIZE.size + header_size])
+        self._records_offset = _HEADER_SIZE.size + header_size
+        self._count = self.header["count"]
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _source_stamp(catalog: TopicCatalog) -> Dict[str, Any]:
+        st = os.stat(catalog.path)
+        return {"version": _INDEX_VERSION, "format": catalog.format, "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns, "default_domain": catalog.default_domain}
+
+    @classmethod
+    def open_or_build(cls, catalog: TopicCatalog) -> "_TopicIndex":
+        stamp = cls._source_stamp(catalog)
+        paths = (catalog.index_path, _fallback_index_path(catalog.index_path))
+        for path in paths:
+            index = cls._open_fresh(path, stamp)
+            if index is not None:
+                return index
+        data = cls.build(catalog, stamp)
+        for path in paths:
+            if cls._store(path, data):
+                index = cls._open_fresh(path, stamp)
+                if index is not None:
+                    return index
+        return cls(data)
+
+    @classmethod
+    def _open_fresh(cls, path: str, stamp: Dict[str, Any]) -> Optional["_TopicIndex"]:
+        """The index at path if it exists, is readable and was built from this source."""
+        try:
+            index = cls(path)
+        except OSError:
+            return None
+        if index.header.get("source") == stamp:
+            return index
+        index.close()
+        return None
+
+    @staticmethod
+    def _store(path: str, data: bytes) -> bool:
+        """Writes the index atomically; False if path can't be written."""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with atomic_open(path, "wb") as f:
+                f.write(data)
+        except OSError:
+            # Either the directory is read-only, or a concurrent builder's replace
+            # got in first (Windows won't replace a mapped file): use theirs.
+            return os.path.exists(path)
+        return True
+
+    @staticmethod
+    def build(catalog: TopicCatalog, stamp: Dict[str, Any]) -> bytes:
+        """One streaming pass over the source; only fixed-size columns are kept in memory."""
+        ids, offsets, lengths, domain_numbers = array("q"), array("Q"), array("I"), array("I")
+        domain_names: Dict[str, int] = {}
+        for offset, length, topic in catalog._scan():
+            ids.append(topic.id)
+            offsets.append(offset)
+            lengths.append(length)
+            domain_numbers.append(domain_names.setdefault(topic.domain, len(domain_names)))
+
+        order: Iterable[int] = range(len(ids))
+        if any(ids[i] >= ids[i + 1] for i in range(len(ids) - 1)):
+            order = sorted(order, key=ids.__getitem__)
+
+        records = bytearray()
+        postings: List[array] = [array("I") for _ in domain_names]
+        for position, i in enumerate(order):
+            records += _RECORD.pack(ids[i], offsets[i], lengths[i], domain_numbers[i])
+            postings[domain_numbers[i]].append(position)
+
+        domains, postings_offset = [], len(records)
+        for name, number in domain_names.items():
+            domains.append([name, postings_offset, len(postings[number])])
+            postings_offset += len(postings[number]) * postings[number].itemsize
+
+        header = json.dumps({"source": stamp, "count": len(ids), "domains": domains}).encode("utf-8")
+        return b"".join([_HEADER_SIZE.pack(len(header)), header, records]
+                        + [posting.tobytes() for posting in postings])
+
+    def record(self, position: int) -> Tuple[int, int, int, int]:
+        return _RECORD.unpack_from(self._mm, self._records_offset + position * _RECORD.size)
+
+    def position(self, topic_id: int) -> Optional[int]:
+        """Binary search over the id-sorted records."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            current = self.record(middle)[0]
+            if current < topic_id:
+                low = middle + 1
+            elif current > topic_id:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def positions(self, domain: Optional[str] = None, start: int = 0,
+                  stop: Optional[int] = None) -> Iterator[int]:
+        """Record positions in id order, of all topics or one domain, sliced to [start, stop)."""
+        if domain is None:
+            return iter(range(self._count)[start:stop])
+        for name, offset, count in self.header["domains"]:
+            if name == domain:
+                return self._postings(self._records_offset + offset, range(count)[start:stop])
+        return iter(())
+
+    def _postings(self, base: int, indexes: range) -> Iterator[int]:
+        # Read one at a time: a memoryview over the mmap would stop close() while a
+        # filter() or slice() generator is still alive.
+        for i in indexes:
+            yield _POSTING.unpack_from(self._mm, base + i * _POSTING.size)[0]
+
+    def domain_counts(self) -> Dict[str, int]:
+        return {name: count for name, _, count in self.header["domains"]}
+
+    def close(self):
+        if self._file is not None:
+            self._mm.close()
+            self._file.close()
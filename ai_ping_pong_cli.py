@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Command-line interface for the AI Ping-Pong expert workflow.
+
+  generate  generate opinion pieces for a topic source into an output directory
+  resume    like generate, but skip topics whose manifest record is still up to date
+  bench     run the benchmark harness (arguments as for ai_ping_pong_bench.py)
+  stats     summarise an output directory or a topic file
+  serve     keep a warm workflow in memory and run batches posted over HTTP
+  shard     spread a run over several machines: enqueue, work, merge, status
+
+Only the standard argparse/json/os/sys modules are imported up front; the workflow,
+backends, caches and serializers load when a subcommand needs them, so --help
+and small runs start fast.
+
+--backend api calls /api/generate on api-server-v4.cjs, which only answers a
+signed-in session: pass its cookie with --api-cookie (or AI_PING_PONG_API_COOKIE),
+e.g. --api-cookie 'ai-ping-pong-session=s%3A...' copied from the browser, and any
+other headers with --api-header 'Name: value'.
+
+A running `serve` instance takes batches with e.g.:
+  curl -s -X POST localhost:3003/batch -d '{"topics": "topics.txt", "output_dir": "outputs"}'
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_OUTPUT_DIR = "ai_ping_pong_expert_content"
+DEFAULT_CACHE_DIR = ".ai_ping_pong_cache"
+DEFAULT_SERVE_PORT = 3003
+API_COOKIE_ENV = "AI_PING_PONG_API_COOKIE"
+
+# Mirrors of TopicExecutor.BACKENDS, BatchWriter.PACK_FORMATS and the catalog
+# formats, repeated here so building the parser doesn't import those modules.
+EXECUTORS = ("sequential", "thread", "process", "asyncio")
+PACK_FORMATS = ("files", "tar", "zip", "jsonl", "parquet")
+TOPIC_FORMATS = ("jsonl", "json", "text")
+CACHE_MODES = ("off", "memory", "disk")
+MODEL_BACKENDS = ("simulated", "api", "stub")
+
+
+# --- Workflow and topic setup ---
+
+def build_workflow(cache: str = "off", cache_dir: str = DEFAULT_CACHE_DIR,
+                   backend: str = "simulated", api_base: Optional[str] = None,
+                   templates: Optional[str] = None, profile: bool = False,
+                   api_headers: Optional[Dict[str, str]] = None):
+    """
+    Builds an AIPingPongExpertWorkflow from CLI-style settings. api_headers are sent
+    with every --backend api call; /api/generate needs a session Cookie among them.
+    """
+    from ai_ping_pong_expert_workflow import AIPingPongExpertWorkflow
+
+    step_cache = None
+    if cache != "off":
+        from ai_ping_pong_cache import StepCache
+        step_cache = StepCache(directory=cache_dir if cache == "disk" else None)
+
+    backends = None
+    if backend != "simulated":
+        from ai_ping_pong_backends import DEFAULT_API_BASE, APIServerBackend, StubBackend
+        models = sorted(set(AIPingPongExpertWorkflow.STEP_MODELS.values()))
+        if backend == "api":
+            backends = {model: APIServerBackend(model, api_base or DEFAULT_API_BASE, api_headers)
+                        for model in models}
+        else:
+            backends = {model: StubBackend(model) for model in models}
+
+    template_set = None
+    if templates:
+        from ai_ping_pong_templates import TemplateSet
+        template_set = TemplateSet.from_directory(templates)
+
+    profiler = None
+    if profile:
+        from ai_ping_pong_profiling import PipelineProfiler
+        profiler = PipelineProfiler()
+
+    return AIPingPongExpertWorkflow(step_cache=step_cache, profiler=profiler,
+                                    backends=backends, templates=template_set)
+
+
+def select_topics(workflow, source: Any = None, fmt: Optional[str] = None,
+                  domain: Optional[str] = None, offset: int = 0,
+                  limit: Optional[int] = None, catalog=None) -> Iterable[Any]:
+    """
+    Topics from a catalog file path, a list of topics/topic dicts, or the built-in
+    set when source is None, optionally limited to one domain and to
+    [offset, offset + limit). A file read in full streams without an index;
+    domain or slice selection uses the catalog's offset index.
+    """
+    stop = offset + limit if limit is not None else None
+    if not isinstance(source, str):
+        import itertools
+        from ai_ping_pong_models import Topic
+        if source is None:
+            topics = workflow.generate_tangential_topics()
+        else:
+            topics = [Topic.coerce(topic) for topic in source]
+        if domain is not None:
+            topics = [topic for topic in topics if topic.domain == domain]
+        return itertools.islice(topics, offset, stop)
+
+    if catalog is None:
+        from ai_ping_pong_catalog import TopicCatalog
+        catalog = TopicCatalog(source, fmt)
+    if domain is None and offset == 0 and stop is None:
+        return iter(catalog)
+    return catalog.slice(offset, stop, domain)
+
+
+def plan_topics(workflow, topics: Iterable[Any], output_dir: str, incremental: bool,
+                manifest_name: Optional[str] = None) -> Tuple[List[Any], int]:
+    """Dry run: returns (topics that would be generated, number already up to date)."""
+    from ai_ping_pong_expert_workflow import StreamingContentWriter
+
+    previous = {}
+    if incremental:
+        previous = StreamingContentWriter.load_manifest(
+            os.path.join(output_dir, manifest_name or StreamingContentWriter.MANIFEST_NAME))
+    pipeline_version = workflow.pipeline_version() if previous else None
+    pending, fresh = [], 0
+    for topic in topics:
+        if previous and StreamingContentWriter.record_is_fresh(
+                previous.get(topic.id), workflow.topic_fingerprint(topic, pipeline_version), output_dir):
+            fresh += 1
+        else:
+            pending.append(topic)
+    return pending, fresh
+
+
+# --- Subcommands ---
+
+def _workflow_from_args(args: argparse.Namespace, profile: bool = False):
+    headers = dict(args.api_header)
+    if args.api_cookie:
+        headers["Cookie"] = args.api_cookie
+    return build_workflow(args.cache, args.cache_dir, args.backend, args.api_base,
+                          args.templates, profile, headers)
+
+
+def _topics_from_args(workflow, args: argparse.Namespace) -> Iterable[Any]:
+    topics = select_topics(workflow, args.topics, args.format, args.domain, args.offset, args.limit)
+    if getattr(args, "shard", None):
+        from ai_ping_pong_shard import partition
+        topics = partition(topics, *args.shard)
+    return topics
+
+
+def _static_manifest_name(args: argparse.Namespace) -> Optional[str]:
+    """A static shard keeps its records in its own manifest, so shards can share output_dir."""
+    if not getattr(args, "shard", None):
+        return None
+    from ai_ping_pong_shard import static_manifest_name
+    return static_manifest_name(args.shard[0])
+
+
+def run_batch(args: argparse.Namespace, incremental: bool) -> int:
+    workflow = _workflow_from_args(args, profile=bool(args.profile))
+    topics = _topics_from_args(workflow, args)
+    manifest_name = _static_manifest_name(args)
+
+    if args.dry_run:
+        pending, fresh = plan_topics(workflow, topics, args.output_dir, incremental, manifest_name)
+        for topic in pending:
+            print(f"{topic.id}. {topic.title}")
+        print(f"🧪 Dry run: {len(pending)} topics to generate, {fresh} up to date in {args.output_dir}/")
+        return 0
+
+    pack = getattr(args, "pack", "files")
+    if pack != "files":
+        # Packed output is assembled from the whole batch, so it goes through generate_all_content.
+        content = workflow.generate_all_content(args.executor, args.max_concurrency, topics)
+        workflow.save_content(content, args.output_dir, pack)
+        metadata = content['metadata']
+        generated, skipped = metadata['total_pieces'], 0
+        total_words = sum(piece.word_count for piece in content['opinion_pieces'].values())
+        failures = content['failed_topics']
+    else:
+        metadata = workflow.stream_content(topics, args.output_dir, args.executor,
+                                           args.max_concurrency, incremental, manifest_name)
+        generated, skipped = metadata['generated_pieces'], metadata['skipped_pieces']
+        total_words = metadata['total_words']
+        failures = [record for record in _manifest_records(args.output_dir, manifest_name)
+                    if record['status'] == 'failed']
+
+    print(f"✅ Generated {generated} opinion pieces" + (f", {skipped} up to date" if skipped else ""))
+    for failure in failures:
+        print(f"❌ Topic {failure['id']} failed: {failure['error']}")
+    print(f"📊 Total word count: {total_words:,} words")
+    if manifest_name:
+        print(f"🧩 Shard {args.shard[0]}/{args.shard[1]} done; once every shard is, run "
+              f"`shard merge -o {args.output_dir}` for manifest.jsonl, metadata.json and summary.md")
+    if args.profile:
+        workflow.profiler.write_chrome_trace(args.profile)
+        print(f"⏱️  Chrome trace saved to {args.profile}")
+    return 1 if failures else 0
+
+
+def _manifest_records(output_dir: str, manifest_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    from ai_ping_pong_expert_workflow import StreamingContentWriter
+    path = os.path.join(output_dir, manifest_name or StreamingContentWriter.MANIFEST_NAME)
+    return list(StreamingContentWriter.load_manifest(path).values())
+
+
+def run_bench(bench_args: List[str]) -> int:
+    import ai_ping_pong_bench
+    parser = ai_ping_pong_bench.build_parser(argparse.ArgumentParser(
+        prog=f"{os.path.basename(sys.argv[0])} bench",
+        description=ai_ping_pong_bench.__doc__.strip().splitlines()[0]))
+    return ai_ping_pong_bench.run_from_args(parser.parse_args(bench_args))
+
+
+def output_stats(output_dir: str) -> Dict[str, Any]:
+    """Counts, words and generation times from an output directory's manifest."""
+    from ai_ping_pong_profiling import percentile
+
+    records = _manifest_records(output_dir)
+    pieces = [record for record in records if record['status'] == 'ok']
+    words = [record['word_count'] for record in pieces]
+    times = sorted(record['total_time'] for record in pieces)
+    domains: Dict[str, int] = {}
+    for record in pieces:
+        domains[record['domain']] = domains.get(record['domain'], 0) + 1
+    return {
+        'output_dir': output_dir,
+        'pieces': len(pieces),
+        'failed': len(records) - len(pieces),
+        'total_words': sum(words),
+        'mean_words': sum(words) / len(words) if words else 0,
+        'total_time': {'p50': percentile(times, 50), 'p95': percentile(times, 95),
+                       'max': times[-1] if times else 0.0},
+        'domains': domains
+    }
+
+
+def catalog_stats(path: str, fmt: Optional[str] = None) -> Dict[str, Any]:
+    from ai_ping_pong_catalog import TopicCatalog
+    with TopicCatalog(path, fmt) as catalog:
+        return {'source': path, 'format': catalog.format, 'topics': len(catalog),
+                'domains': catalog.domains()}
+
+
+def run_stats(args: argparse.Namespace) -> int:
+    if os.path.isdir(args.path):
+        stats = output_stats(args.path)
+    elif os.path.isfile(args.path):
+        stats = catalog_stats(args.path, args.format)
+    else:
+        print(f"❌ No such output directory or topic file: {args.path}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return 0
+    if 'pieces' in stats:
+        print(f"📁 {stats['output_dir']}/: {stats['pieces']} pieces, {stats['failed']} failed")
+        print(f"📊 {stats['total_words']:,} words, {stats['mean_words']:,.0f} per piece")
+        print(f"⏱️  Generation time p50 {stats['total_time']['p50'] * 1e3:.2f} ms, "
+              f"p95 {stats['total_time']['p95'] * 1e3:.2f} ms")
+    else:
+        print(f"📖 {stats['source']} ({stats['format']}): {stats['topics']:,} topics")
+    for domain, count in sorted(stats['domains'].items(), key=lambda item: -item[1]):
+        print(f"   - {domain}: {count:,}")
+    return 0
+
+
+def run_shard(args: argparse.Namespace) -> int:
+    from ai_ping_pong_shard import WorkQueue, merge_shards, run_worker
+
+    if args.shard_command == "merge":
+        from ai_ping_pong_expert_workflow import AIPingPongExpertWorkflow
+        queue = WorkQueue(args.queue) if args.queue else None
+        try:
+            metadata = merge_shards(AIPingPongExpertWorkflow(), args.output_dir, queue)
+        finally:
+            if queue is not None:
+                queue.close()
+        print(f"✅ Merged {len(metadata['shards'])} shard manifests: {metadata['total_pieces']} pieces, "
+              f"{metadata['failed_pieces']} failed, {metadata['total_words']:,} words")
+        if metadata['queue'] and metadata['queue']['pending'] + metadata['queue']['claimed']:
+            print(f"⚠️  Queue not drained yet: {metadata['queue']}")
+        return 0
+
+    with WorkQueue(args.queue) as queue:
+        if args.shard_command == "enqueue":
+            workflow = build_workflow()
+            try:
+                added = queue.enqueue(_topics_from_args(workflow, args), args.shards)
+            except ValueError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                return 1
+            print(f"📥 Queued {added:,} new topics across {args.shards} shards in {args.queue}")
+            return 0
+
+        if args.shard_command == "status":
+            status = {'num_shards': queue.num_shards, 'counts': queue.counts(),
+                      'shards': queue.shard_counts()}
+            if args.json:
+                print(json.dumps(status, indent=2))
+            else:
+                print(f"📋 {args.queue}: {status['num_shards']} shards, {status['counts']}")
+                for shard, counts in status['shards'].items():
+                    print(f"   - shard {shard}: {counts}")
+            return 0
+
+        result = run_worker(_workflow_from_args(args), queue, args.output_dir, args.worker,
+                            args.home_shard, args.executor, args.max_concurrency,
+                            args.batch_size, args.lease, not args.no_steal)
+        print(f"✅ Worker {result['worker']}: {result['generated_pieces']} pieces in "
+              f"{result['batches']} batches, {result['failed_pieces']} failed")
+        return 1 if result['failed_pieces'] else 0
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    from ai_ping_pong_server import serve
+    workflow = _workflow_from_args(args)
+    return serve(workflow, args.host, args.port, {
+        'output_dir': args.output_dir,
+        'executor': args.executor,
+        'max_concurrency': args.max_concurrency
+    })
+
+
+# --- Argument parsing ---
+
+def _add_workflow_options(parser: argparse.ArgumentParser, default_cache: str = "off"):
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"where pieces, manifest and summary go (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("-e", "--executor", default="sequential", choices=EXECUTORS)
+    parser.add_argument("-j", "--max-concurrency", type=int, default=None)
+    parser.add_argument("--cache", default=default_cache, choices=CACHE_MODES,
+                        help=f"step cache: off, in-memory, or memory plus disk (default: {default_cache})")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"directory for --cache disk (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--backend", default="simulated", choices=MODEL_BACKENDS,
+                        help="simulated steps, the /api/generate server, or an offline stub")
+    parser.add_argument("--api-base", help="API server URL for --backend api (default: http://localhost:3002)")
+    parser.add_argument("--api-cookie", default=os.environ.get(API_COOKIE_ENV),
+                        help="Cookie header of a signed-in session; /api/generate requires one "
+                             f"(default: ${API_COOKIE_ENV})")
+    parser.add_argument("--api-header", type=_api_header, action="append", default=[],
+                        metavar="'NAME: VALUE'", help="extra header for --backend api calls (repeatable)")
+    parser.add_argument("--templates", help="directory of <template name>.md overrides")
+
+
+def _api_header(value: str) -> Tuple[str, str]:
+    name, sep, header_value = value.partition(":")
+    if not sep or not name.strip():
+        raise argparse.ArgumentTypeError(f"expected 'Name: value', got '{value}'")
+    return name.strip(), header_value.strip()
+
+
+def _shard_spec(value: str) -> Tuple[int, int]:
+    try:
+        shard, num_shards = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected K/N, got '{value}'") from None
+    if not 0 <= shard < num_shards:
+        raise argparse.ArgumentTypeError(f"shard K must be in 0..N-1, got '{value}'")
+    return shard, num_shards
+
+
+def _add_topic_options(parser: argparse.ArgumentParser, static_shard: bool = True):
+    parser.add_argument("-t", "--topics", help="topic file (JSON, JSONL or numbered text like topics.txt); "
+                                               "default: the 10 built-in topics")
+    parser.add_argument("--format", choices=TOPIC_FORMATS, help="topic file format (default: from extension)")
+    parser.add_argument("--domain", help="only topics from this domain")
+    parser.add_argument("--offset", type=int, default=0, help="skip this many selected topics")
+    parser.add_argument("--limit", type=int, help="process at most this many topics")
+    if static_shard:
+        parser.add_argument("--shard", type=_shard_spec, metavar="K/N",
+                            help="only topics that hash to shard K of N (no shared queue needed); "
+                                 "records go to manifest-shardK.jsonl for `shard merge`")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    for name, help_text in (("generate", "generate pieces, replacing any previous run"),
+                            ("resume", "generate only topics that are new or changed since the last run")):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        _add_topic_options(command)
+        _add_workflow_options(command)
+        command.add_argument("-n", "--dry-run", action="store_true",
+                             help="list the topics that would be generated and exit")
+        command.add_argument("--profile", metavar="TRACE_JSON",
+                             help="write a Chrome trace of per-step timings")
+        if name == "generate":
+            command.add_argument("--pack", default="files", choices=PACK_FORMATS,
+                                 help="write all pieces into one archive/file (holds the batch in memory)")
+
+    commands.add_parser("bench", help="run benchmarks (see `bench --help`)", add_help=False)
+
+    stats = commands.add_parser("stats", help="summarise an output directory or a topic file")
+    stats.add_argument("path", nargs="?", default=DEFAULT_OUTPUT_DIR)
+    stats.add_argument("--format", choices=TOPIC_FORMATS)
+    stats.add_argument("--json", action="store_true", help="print the stats as JSON")
+
+    serve = commands.add_parser("serve", help="run batches posted over HTTP with a warm workflow")
+    _add_workflow_options(serve, default_cache="memory")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_SERVE_PORT)
+
+    shard = commands.add_parser("shard", help="spread a run over several machines via a shared SQLite queue")
+    actions = shard.add_subparsers(dest="shard_command", required=True, metavar="ACTION")
+    enqueue = actions.add_parser("enqueue", help="partition topics into N shards and add new ones to the queue")
+    enqueue.add_argument("queue", help="SQLite queue file on shared storage")
+    enqueue.add_argument("-N", "--shards", type=int, required=True, help="number of shards")
+    _add_topic_options(enqueue, static_shard=False)
+
+    work = actions.add_parser("work", help="claim and generate batches until the queue is drained")
+    work.add_argument("queue", help="SQLite queue file on shared storage")
+    _add_workflow_options(work)
+    work.add_argument("--worker", help="worker name (default: <hostname>-<pid>)")
+    work.add_argument("--shard", dest="home_shard", type=int, help="shard to drain first (default: any)")
+    work.add_argument("--no-steal", action="store_true", help="stop when the home shard is drained")
+    work.add_argument("--batch-size", type=int, default=16, help="topics per claim (default: 16)")
+    work.add_argument("--lease", type=float, default=600.0,
+                      help="seconds before an unfinished claim can be taken over (default: 600)")
+
+    merge = actions.add_parser("merge", help="combine shard manifests into manifest.jsonl, metadata.json, summary.md")
+    merge.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
+    merge.add_argument("--queue", help="queue file, to include its task counts in metadata.json")
+
+    status = actions.add_parser("status", help="task counts per status and shard")
+    status.add_argument("queue", help="SQLite queue file on shared storage")
+    status.add_argument("--json", action="store_true", help="print the counts as JSON")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "bench":
+        # bench options belong to ai_ping_pong_bench's own parser, imported only now.
+        return run_bench(extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command in ("generate", "resume"):
+        if args.shard and getattr(args, "pack", "files") != "files":
+            parser.error("--pack writes one archive per run and can't be combined with --shard")
+        return run_batch(args, incremental=args.command == "resume")
+    if args.command == "stats":
+        return run_stats(args)
+    if args.command == "shard":
+        return run_shard(args)
+    return run_serve(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,14 +4,473 @@ AI Ping-Pong Expert Content Generation Workflow
 Generate 20 tangential topics and 20 opinion pieces to establish expertise
 """
 
+import hashlib
+import itertools
 import json
 import os
+import pickle
+import time
+from collections import deque
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import partial
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+from ai_ping_pong_cache import StepCache, code_fingerprint, make_key
+from ai_ping_pong_models import ArgumentSections, PieceResult, Topic
+from ai_ping_pong_output import BatchWriter, atomic_open, atomic_write, piece_filename
+from ai_ping_pong_profiling import PipelineProfiler
+from ai_ping_pong_templates import TemplateSet
+
+# asyncio, concurrent.futures and the backends (http.client, ssl) together cost more
+# to import than the rest of the module; they are imported where first used so
+# short CLI runs start fast.
+if TYPE_CHECKING:
+    from ai_ping_pong_backends import ModelBackend
+
+
+# (result, error) pair for one topic; exactly one side is None.
+TopicOutcome = Tuple[Any, Optional[str]]
+
+
+def _call_isolated(fn: Callable[[Any], Any], item: Any) -> TopicOutcome:
+    """Runs fn(item) and captures any exception so one bad topic can't sink the batch."""
+    try:
+        return fn(item), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+# The per-topic function of a process pool worker, set once by _init_worker.
+_worker_fn: Optional[Callable[[Any], Any]] = None
+
+
+def _init_worker(pickled_fn: bytes):
+    global _worker_fn
+    _worker_fn = pickle.loads(pickled_fn)
+
+
+def _call_in_worker(item: Any) -> TopicOutcome:
+    return _call_isolated(_worker_fn, item)
+
+
+def _call_chunk_in_worker(items: List[Any]) -> List[TopicOutcome]:
+    return [_call_isolated(_worker_fn, item) for item in items]
+
+
+def _pool(backend: str, fn: Callable[[Any], Any], workers: int):
+    """
+    Returns (pool, per-item callable). A process pool receives fn once per worker
+    through its initializer, so only topics are pickled per task rather than a
+    bound method that drags the whole workflow (templates, caches) along each time.
+    fn is pickled explicitly: under fork, initargs would be inherited as-is and the
+    worker would not get the detached profiler and cache copies that __getstate__ makes.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=workers), partial(_call_isolated, fn)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(pickle.dumps(fn),))
+    return pool, _call_in_worker
+
+
+class TopicExecutor:
+    """
+    Runs a per-topic function over a batch of topics with a pluggable backend.
+    Outcomes are always returned in input order, one (result, error) pair per topic.
+    """
+
+    BACKENDS = ("sequential", "thread", "process", "asyncio")
+
+    def __init__(self, backend: str = "sequential", max_concurrency: Optional[int] = None):
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown executor backend '{backend}'. Choose one of: {', '.join(self.BACKENDS)}")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.backend = backend
+        self.max_concurrency = max_concurrency or min(32, (os.cpu_count() or 1) + 4)
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[TopicOutcome]:
+        items = list(items)
+        if not items:
+            return []
+        if self.backend == "sequential":
+            return [_call_isolated(fn, item) for item in items]
+        if self.backend == "asyncio":
+            import asyncio
+            return asyncio.run(self.amap(fn, items))
+
+        workers = min(self.max_concurrency, len(items))
+        pool, call = _pool(self.backend, fn, workers)
+        with pool:
+            if self.backend == "thread":
+                return list(pool.map(call, items))
+            # Process pools pay a pickling round-trip per task, so hand out topics in chunks.
+            chunksize = max(1, len(items) // (workers * 4))
+            return list(pool.map(call, items, chunksize=chunksize))
+
+    def imap(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Tuple[Any, Any, Optional[str]]]:
+        """
+        Lazy, order-preserving variant of map that yields (item, result, error) as
+        soon as each item is done. At most 2 * max_concurrency items (process
+        backend: chunks of PROCESS_CHUNK_SIZE items) are in flight, so memory
+        stays flat however long the input is.
+        """
+        if self.backend == "sequential":
+            for item in items:
+                yield (item, *_call_isolated(fn, item))
+            return
+
+        window = self.max_concurrency * 2
+        if self.backend == "asyncio":
+            import asyncio
+            loop = asyncio.new_event_loop()
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            pending = deque()
+            try:
+                # The same sliding window as the pools below: awaiting the oldest
+                # task runs the loop, so later tasks keep going past a slow one.
+                for item in items:
+                    pending.append((item, loop.create_task(self._arun_isolated(fn, item, semaphore))))
+                    if len(pending) >= window:
+                        done_item, task = pending.popleft()
+                        yield (done_item, *loop.run_until_complete(task))
+                while pending:
+                    done_item, task = pending.popleft()
+                    yield (done_item, *loop.run_until_complete(task))
+            finally:
+                # Left over only when the consumer stops early.
+                for _, task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*(task for _, task in pending),
+                                                           return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_default_executor())
+                loop.close()
+            return
+
+        pool, call = _pool(self.backend, fn, self.max_concurrency)
+        if self.backend == "process":
+            yield from self._imap_chunks(pool, items, window)
+            return
+        with pool:
+            pending = deque()
+            for item in items:
+                pending.append((item, pool.submit(call, item)))
+                if len(pending) >= window:
+                    done_item, future = pending.popleft()
+                    yield (done_item, *future.result())
+            while pending:
+                done_item, future = pending.popleft()
+                yield (done_item, *future.result())
+
+    # Topics per process pool task: enough to amortise the IPC round-trip,
+    # few enough that results still stream out promptly.
+    PROCESS_CHUNK_SIZE = 8
+
+    def _imap_chunks(self, pool, items: Iterable[Any],
+                     window: int) -> Iterator[Tuple[Any, Any, Optional[str]]]:
+        """The process branch of imap: the same window, counted in chunks of topics."""
+        items = iter(items)
+        with pool:
+            pending = deque()
+            while True:
+                chunk = list(itertools.islice(items, self.PROCESS_CHUNK_SIZE))
+                if chunk:
+                    pending.append((chunk, pool.submit(_call_chunk_in_worker, chunk)))
+                if pending and (len(pending) >= window or not chunk):
+                    done_chunk, future = pending.popleft()
+                    for item, outcome in zip(done_chunk, future.result()):
+                        yield (item, *outcome)
+                elif not chunk:
+                    return
+
+    async def amap(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[TopicOutcome]:
+        """Asyncio backend: coroutine functions are awaited, plain functions run in the default thread pool."""
+        import asyncio
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(*(self._arun_isolated(fn, item, semaphore) for item in items))
+
+    @staticmethod
+    async def _arun_isolated(fn: Callable[[Any], Any], item: Any, semaphore) -> TopicOutcome:
+        """_call_isolated for the asyncio backend, once semaphore admits the item."""
+        import asyncio
+        async with semaphore:
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    return await fn(item), None
+                return await asyncio.get_running_loop().run_in_executor(None, fn, item), None
+            except Exception as e:
+                return None, f"{type(e).__name__}: {e}"
+
+
+class StreamingContentWriter:
+    """
+    Writes each opinion piece to disk the moment it is generated and appends a
+    record for it to manifest.jsonl, so a crash only loses the pieces in flight.
+
+    In incremental mode the existing manifest is kept and used as a checkpoint:
+    it is an append-only log where the latest record per topic id wins.
+    manifest_name lets several writers (e.g. shard workers) share one output_dir.
+    """
+
+    MANIFEST_NAME = "manifest.jsonl"
+
+    def __init__(self, output_dir: str, incremental: bool = False,
+                 manifest_name: Optional[str] = None):
+        self.output_dir = output_dir
+        self.written = 0
+        self.failed = 0
+        self.skipped = 0
+        self.total_words = 0
+        os.makedirs(output_dir, exist_ok=True)
+        self.manifest_path = os.path.join(output_dir, manifest_name or self.MANIFEST_NAME)
+        self.previous = self.load_manifest(self.manifest_path) if incremental else {}
+        self._manifest = open(self.manifest_path, 'a' if incremental else 'w', encoding='utf-8')
+        if incremental and self._manifest.tell() > 0:
+            # Terminate a record torn by an interrupted run so new records start on a fresh line.
+            with open(self.manifest_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._append_line("")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def iter_manifest(manifest_path: str) -> Iterator[Dict[str, Any]]:
+        """Streams a manifest's records in file order, skipping a torn line."""
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    @classmethod
+    def load_manifest(cls, manifest_path: str) -> Dict[Any, Dict[str, Any]]:
+        """Reads a manifest into {topic id: latest record}, ignoring a torn last line."""
+        return {record['id']: record for record in cls.iter_manifest(manifest_path)}
+
+    def totals(self) -> Dict[str, int]:
+        """Topic, piece, failure and word counts over every record in the manifest."""
+        totals = {'topics': 0, 'pieces': 0, 'failed': 0, 'words': 0}
+        for record in self.iter_manifest(self.manifest_path):
+            totals['topics'] += 1
+            if record['status'] == 'ok':
+                totals['pieces'] += 1
+                totals['words'] += record['word_count']
+            else:
+                totals['failed'] += 1
+        return totals
+
+    def is_fresh(self, topic_id: Any, input_hash: str) -> bool:
+        """True when a previous run already wrote this topic from identical inputs."""
+        return self.record_is_fresh(self.previous.get(topic_id), input_hash, self.output_dir)
+
+    @staticmethod
+    def record_is_fresh(record: Optional[Dict[str, Any]], input_hash: str, output_dir: str) -> bool:
+        """True when a manifest record is a completed piece written from identical inputs."""
+        # Record paths are relative to output_dir; older manifests stored output_dir/name.
+        return (record is not None and record['status'] == 'ok'
+                and record.get('input_hash') == input_hash
+                and os.path.exists(os.path.join(output_dir, os.path.basename(record['path']))))
+
+    def record_skipped(self, topic_id: Any):
+        self.skipped += 1
+        self.total_words += self.previous[topic_id]['word_count']
+
+    def write_piece(self, topic: Topic, piece: PieceResult, input_hash: Optional[str] = None) -> str:
+        """Writes one piece's markdown file and its manifest record; returns the file path."""
+        name = piece_filename(topic.id, topic.title)
+        filename = os.path.join(self.output_dir, name)
+        atomic_write(filename, piece.content)
+        self._append({
+            'id': topic.id,
+            'status': 'ok',
+            'input_hash': input_hash,
+            # Relative, so the directory can be resumed from any cwd or mount point.
+            'path': name,
+            'title': topic.title,
+            'domain': topic.domain,
+            'question': topic.question,
+            'thesis': topic.thesis,
+            'word_count': piece.word_count,
+            'char_count': piece.char_count,
+            'section_count': piece.section_count,
+            'total_time': piece.total_time,
+            'generated_at': piece.generated_at
+        })
+        self.written += 1
+        self.total_words += piece.word_count
+        return filename
+
+    def write_failure(self, topic: Topic, error: str):
+        self._append({'id': topic.id, 'status': 'failed', 'title': topic.title, 'error': error})
+        self.failed += 1
+
+    def compact(self, keep_ids: Optional[set] = None):
+        """Rewrites the manifest with one record per topic, optionally limited to keep_ids."""
+        self.close()
+        records = self.load_manifest(self.manifest_path)
+        with atomic_open(self.manifest_path) as f:
+            for topic_id, record in records.items():
+                if keep_ids is None or topic_id in keep_ids:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _append(self, record: Dict[str, Any]):
+        self._append_line(json.dumps(record, ensure_ascii=False))
+
+    def _append_line(self, line: str):
+        self._manifest.write(line + "\n")
+        self._manifest.flush()
+
+    def close(self):
+        if not self._manifest.closed:
+            self._manifest.close()
+
+
+# The built-in topic set, built once; Topic is immutable, so it is shared rather than copied.
+_BUILTIN_TOPICS = tuple(map(Topic.coerce, (
+    {
+        "id": 1,
+        "title": "The AI Trinity: Can Three Models in a Loop Simulate Consciousness?",
+        "domain": "Metaphysics & AI",
+        "question": "If consciousness is an emergent property of feedback loops, what emerges from an orchestrated AI 'super-consciousness'?",
+        "thesis": "we can create a rudimentary 'synthetic consciousness' by orchestrating three specialized AI models—one as the 'Id' (raw creativity), one as the 'Ego' (logic and reasoning), and one as the 'Superego' (ethical oversight)—in a constant feedback loop. The resulting emergent behavior is more than a workflow; it's a new form of cognitive architecture."
+    },
+    {
+        "id": 2,
+        "title": "Digital Psychoanalysis: Using AI Ping-Pong to Debug Your Own Brain",
+        "domain": "Psychology & Self-Help",
+        "question": "Can an individual use multi-model AI to achieve therapeutic breakthroughs?",
+        "thesis": "professional therapy can be augmented with a personal AI 'dream team': a Jungian model to interpret archetypes in your daily life, a Stoic model to reframe cognitive distortions, and a narrative model to help you rewrite your personal story. This creates a new paradigm for guided self-reflection."
+    },
+    {
+        "id": 3,
+        "title": "The Anti-AI AI: Building an Orchestrated System to Fight Persuasive AI",
+        "domain": "Digital Defense & Ethics",
+        "question": "How do we defend our attention and free will against hyper-optimized AI persuasion?",
+        "thesis": "the only effective defense against persuasive AI is a personalized 'guardian AI' built on Ping-Pong principles. This system would use one model to detect emotional manipulation in media, another to identify logical fallacies, and a third to provide a neutral summary, creating a 'cognitive shield' against algorithmic influence."
+    },
+    {
+        "id": 4,
+        "title": "Culinary Anarchy: Inventing Unthinkable Food with an AI Flavor Committee",
+        "domain": "Gastronomy & Creativity",
+        "question": "Can AI create genuinely new flavor pairings that humans would never conceive of?",
+        "thesis": "human culinary creativity is limited by tradition and experience. A 'flavor committee' of AI models—one expert in chemical compounds, one in cultural flavor pairings, and one in textural mouthfeel—can generate truly novel, and delicious, recipes by exploring a combinatorial space of ingredients that is simply too vast for humans."
+    },
+    {
+        "id": 5,
+        "title": "AI as a Spiritual Companion: The Coming Age of Algorithmic Gurus",
+        "domain": "Theology & Future of Belief",
+        "question": "Could AI systems provide meaningful spiritual guidance?",
+        "thesis": "a 'spiritual companion' AI, built with a Ping-Pong workflow, could offer profound guidance by combining a model trained on sacred texts, a model trained on secular philosophy, and a model trained on mindfulness practices. This allows a user to explore life's biggest questions through a multi-faceted, non-dogmatic lens."
+    },
+    {
+        "id": 6,
+        "title": "Generative History: Using AI Ping-Pong to Simulate Lost Worlds",
+        "domain": "Historiography & Archaeology",
+        "question": "Can we use AI to not just analyze history, but to bring it to life?",
+        "thesis": "we can move beyond static analysis of the past by using an AI committee to create 'generative histories.' By orchestrating a model for social simulation, a model for language reconstruction, and a model for generating visual artifacts, we can create immersive, interactive simulations of ancient civilizations to test historical hypotheses."
+    },
+    {
+        "id": 7,
+        "title": "The Death of the Brainstorm: Why AI Committees Will Kill Corporate Creativity",
+        "domain": "Corporate Strategy & Innovation",
+        "question": "Is human brainstorming an obsolete method for innovation?",
+        "thesis": "the corporate brainstorm, with its social hierarchies and groupthink, is a deeply flawed process. An AI 'innovation committee'—pitting a wildly divergent creative model against a ruthlessly pragmatic business model, refereed by a marketing model—will consistently produce more viable and imaginative ideas than any team of humans."
+    },
+    {
+        "id": 8,
+        "title": "AI Art Heists: Can an AI Committee Plan the Perfect (Fictional) Crime?",
+        "domain": "Creative Writing & Entertainment",
+        "question": "What are the outer limits of AI as a creative partner in genre fiction?",
+        "thesis": "we can write the next great heist novel by using an AI Ping-Pong workflow as a co-conspirator. By using one model to design the museum's security, another to exploit its weaknesses, and a third to write compelling character motivations, a writer can orchestrate a perfectly plotted narrative that is both technically brilliant and emotionally resonant."
+    },
+    {
+        "id": 9,
+        "title": "Investing by Ouija Board: Using Emergent AI Strategy for Financial Markets",
+        "domain": "Finance & Economics",
+        "question": "Can the emergent, unpredictable behavior of AI committees find signals that quants miss?",
+        "thesis": "quantitative analysis is reaching its limits. The next alpha will be found not in data, but in emergent strategy from a 'financial committee' of AIs—one a conservative risk analyst, one an aggressive growth spotter, and one a black-swan event theorist. The human investor's job is not to pick stocks, but to interpret the chaotic, often contradictory, output of their AI committee."
+    },
+    {
+        "id": 10,
+        "title": "The Babel Fish Protocol: Real-Time Universal Translation via AI Ping-Pong",
+        "domain": "Linguistics & Communication",
+        "question": "Why is real-time translation still so awkward and literal?",
+        "thesis": "single-model translation fails because it lacks cultural context. A true 'Babel Fish' requires a Ping-Pong workflow: one model does the literal translation, a second model adds cultural and idiomatic nuance, and a third model adjusts the tone and formality for the specific social context. This is how we move from translation to genuine communication."
+    }
+)))
+
+
+# Parsed once at import and shared by every workflow that doesn't bring its own templates.
+_DEFAULT_TEMPLATE_SET = TemplateSet()
 
 
 class AIPingPongExpertWorkflow:
-    def __init__(self):
+    # Manual version per step, combined with a bytecode fingerprint to form the cache
+    # key version. Bump an entry when a step's output changes for reasons the code
+    # fingerprint can't see (e.g. a different model behind an async override).
+    STEP_VERSIONS = {
+        "step1_define_angle": 1,
+        "step2_gather_research": 1,
+        "step3_synthesize_findings": 1,
+        "step4_structure_argument": 1,
+        "step5_validate_claims": 1,
+        "step6_develop_scenario": 1,
+        "step7_analyze_coherence": 1,
+        "step8_refine_prose": 1,
+        "step9_final_format": 1
+    }
+
+    # Model each step simulates; with `backends` set, the step's draft is sent to that model.
+    STEP_MODELS = {
+        "step1_define_angle": "gpt",
+        "step2_gather_research": "gemini",
+        "step3_synthesize_findings": "gpt",
+        "step4_structure_argument": "claude",
+        "step5_validate_claims": "grok",
+        "step6_develop_scenario": "gpt",
+        "step7_analyze_coherence": "claude",
+        "step8_refine_prose": "gpt"
+    }
+
+    STEP_INSTRUCTIONS = {
+        "step1_define_angle": "Sharpen this opening angle into a provocative, authoritative statement.",
+        "step2_gather_research": "Strengthen this research point with concrete, verifiable evidence.",
+        "step3_synthesize_findings": "Weave the angle and research below into a coherent introduction.",
+        "step4_structure_argument": "Tighten this article section while keeping its heading.",
+        "step5_validate_claims": "Make these counter-arguments rigorous and fair, keeping the heading.",
+        "step6_develop_scenario": "Make this scenario vivid and concrete, keeping the heading.",
+        "step7_analyze_coherence": "Improve the transitions and logical flow of this section.",
+        "step8_refine_prose": "Polish this section for a consistent, authoritative, contrarian voice."
+    }
+
+    # Which ArgumentSections fields a step produces; only those are sent to its model.
+    STEP_OUTPUT_FIELDS = {
+        "step4_structure_argument": ("introduction", "core_paradigm", "implications"),
+        "step5_validate_claims": ("skeptic_view",),
+        "step6_develop_scenario": ("scenario",)
+    }
+
+    def __init__(self, step_cache: Optional[StepCache] = None,
+                 profiler: Optional[PipelineProfiler] = None,
+                 backends: Optional[Dict[str, "ModelBackend"]] = None,
+                 templates: Optional[TemplateSet] = None):
+        self.step_cache = step_cache
+        self.profiler = profiler
+        self.templates = templates or _DEFAULT_TEMPLATE_SET
+        # Model name (gpt, gemini, grok, claude) -> backend. Models without one stay simulated.
+        self.backends = backends or {}
+        self._step_versions: Dict[Any, str] = {}
         self.base_article = {
             "title": "AI Ping-Pong: Manual Multi-Model Workflow for 98% Content Quality",
             "author": "Stanislav Huseletov",
@@ -42,144 +501,252 @@ class AIPingPongExpertWorkflow:
             "credentials": "AI workflow optimization expert"
         }
 
-    def generate_tangential_topics(self) -> List[Dict[str, str]]:
+    def generate_tangential_topics(self) -> List[Topic]:
         """Generate 10 distinct, quirky, and unique topics applying AI Ping-Pong to new domains."""
+        return list(_BUILTIN_TOPICS)
 
-        topics = [
-            {
-                "id": 1,
-                "title": "The AI Trinity: Can Three Models in a Loop Simulate Consciousness?",
-                "domain": "Metaphysics & AI",
-                "question": "If consciousness is an emergent property of feedback loops, what emerges from an orchestrated AI 'super-consciousness'?",
-                "thesis": "we can create a rudimentary 'synthetic consciousness' by orchestrating three specialized AI models—one as the 'Id' (raw creativity), one as the 'Ego' (logic and reasoning), and one as the 'Superego' (ethical oversight)—in a constant feedback loop. The resulting emergent behavior is more than a workflow; it's a new form of cognitive architecture."
-            },
-            {
-                "id": 2,
-                "title": "Digital Psychoanalysis: Using AI Ping-Pong to Debug Your Own Brain",
-                "domain": "Psychology & Self-Help",
-                "question": "Can an individual use multi-model AI to achieve therapeutic breakthroughs?",
-                "thesis": "professional therapy can be augmented with a personal AI 'dream team': a Jungian model to interpret archetypes in your daily life, a Stoic model to reframe cognitive distortions, and a narrative model to help you rewrite your personal story. This creates a new paradigm for guided self-reflection."
-            },
-            {
-                "id": 3,
-                "title": "The Anti-AI AI: Building an Orchestrated System to Fight Persuasive AI",
-                "domain": "Digital Defense & Ethics",
-                "question": "How do we defend our attention and free will against hyper-optimized AI persuasion?",
-                "thesis": "the only effective defense against persuasive AI is a personalized 'guardian AI' built on Ping-Pong principles. This system would use one model to detect emotional manipulation in media, another to identify logical fallacies, and a third to provide a neutral summary, creating a 'cognitive shield' against algorithmic influence."
-            },
-            {
-                "id": 4,
-                "title": "Culinary Anarchy: Inventing Unthinkable Food with an AI Flavor Committee",
-                "domain": "Gastronomy & Creativity",
-                "question": "Can AI create genuinely new flavor pairings that humans would never conceive of?",
-                "thesis": "human culinary creativity is limited by tradition and experience. A 'flavor committee' of AI models—one expert in chemical compounds, one in cultural flavor pairings, and one in textural mouthfeel—can generate truly novel, and delicious, recipes by exploring a combinatorial space of ingredients that is simply too vast for humans."
-            },
-            {
-                "id": 5,
-                "title": "AI as a Spiritual Companion: The Coming Age of Algorithmic Gurus",
-                "domain": "Theology & Future of Belief",
-                "question": "Could AI systems provide meaningful spiritual guidance?",
-                "thesis": "a 'spiritual companion' AI, built with a Ping-Pong workflow, could offer profound guidance by combining a model trained on sacred texts, a model trained on secular philosophy, and a model trained on mindfulness practices. This allows a user to explore life's biggest questions through a multi-faceted, non-dogmatic lens."
-            },
-            {
-                "id": 6,
-                "title": "Generative History: Using AI Ping-Pong to Simulate Lost Worlds",
-                "domain": "Historiography & Archaeology",
-                "question": "Can we use AI to not just analyze history, but to bring it to life?",
-                "thesis": "we can move beyond static analysis of the past by using an AI committee to create 'generative histories.' By orchestrating a model for social simulation, a model for language reconstruction, and a model for generating visual artifacts, we can create immersive, interactive simulations of ancient civilizations to test historical hypotheses."
-            },
-            {
-                "id": 7,
-                "title": "The Death of the Brainstorm: Why AI Committees Will Kill Corporate Creativity",
-                "domain": "Corporate Strategy & Innovation",
-                "question": "Is human brainstorming an obsolete method for innovation?",
-                "thesis": "the corporate brainstorm, with its social hierarchies and groupthink, is a deeply flawed process. An AI 'innovation committee'—pitting a wildly divergent creative model against a ruthlessly pragmatic business model, refereed by a marketing model—will consistently produce more viable and imaginative ideas than any team of humans."
-            },
-            {
-                "id": 8,
-                "title": "AI Art Heists: Can an AI Committee Plan the Perfect (Fictional) Crime?",
-                "domain": "Creative Writing & Entertainment",
-                "question": "What are the outer limits of AI as a creative partner in genre fiction?",
-                "thesis": "we can write the next great heist novel by using an AI Ping-Pong workflow as a co-conspirator. By using one model to design the museum's security, another to exploit its weaknesses, and a third to write compelling character motivations, a writer can orchestrate a perfectly plotted narrative that is both technically brilliant and emotionally resonant."
-            },
-            {
-                "id": 9,
-                "title": "Investing by Ouija Board: Using Emergent AI Strategy for Financial Markets",
-                "domain": "Finance & Economics",
-                "question": "Can the emergent, unpredictable behavior of AI committees find signals that quants miss?",
-                "thesis": "quantitative analysis is reaching its limits. The next alpha will be found not in data, but in emergent strategy from a 'financial committee' of AIs—one a conservative risk analyst, one an aggressive growth spotter, and one a black-swan event theorist. The human investor's job is not to pick stocks, but to interpret the chaotic, often contradictory, output of their AI committee."
-            },
-            {
-                "id": 10,
-                "title": "The Babel Fish Protocol: Real-Time Universal Translation via AI Ping-Pong",
-                "domain": "Linguistics & Communication",
-                "question": "Why is real-time translation still so awkward and literal?",
-                "thesis": "single-model translation fails because it lacks cultural context. A true 'Babel Fish' requires a Ping-Pong workflow: one model does the literal translation, a second model adds cultural and idiomatic nuance, and a third model adjusts the tone and formality for the specific social context. This is how we move from translation to genuine communication."
-            }
-        ]
-
-        return topics
-
-    def generate_opinion_piece(self, topic: Dict[str, str]) -> str:
+    def generate_opinion_piece(self, topic: Union[Topic, Dict[str, Any]]) -> str:
         """
         Generates an opinion piece by simulating a 9-step AI Ping-Pong workflow.
         Each step is simulated by a dedicated internal method.
         """
+        final_article, _ = self._run_pipeline(Topic.coerce(topic))
+        return final_article
+
+    def _run_pipeline(self, topic: Topic) -> Tuple[str, Dict[str, float]]:
+        """Runs the 9 steps once and returns the article with per-step timings in seconds."""
+        timings: Dict[str, float] = {}
+        profiler = self.profiler
+        events = []
+
+        def timed(step, *args):
+            start = time.perf_counter()
+            if profiler is not None:
+                cpu_start = time.thread_time()
+            result = self._call_step(step, *args)
+            elapsed = time.perf_counter() - start
+            timings[step.__name__.lstrip('_')] = elapsed
+            if profiler is not None:
+                events.append(profiler.make_event(
+                    topic.id, step.__name__.lstrip('_'), start, elapsed,
+                    time.thread_time() - cpu_start, result))
+            return result
+
         # Step 1: Define Angle (Simulates GPT-Define)
         # Takes the core thesis and frames it as a provocative opening statement.
-        defined_angle = self._step1_define_angle(topic)
+        defined_angle = timed(self._step1_define_angle, topic)
 
         # Step 2: Gather Research (Simulates Grok/Gemini-Research)
         # Generates supporting points and "evidence" for the thesis.
-        research_points = self._step2_gather_research(topic)
+        research_points = timed(self._step2_gather_research, topic)
 
         # Step 3: Synthesize Findings (Simulates GPT-Integrate)
         # Weaves the research into a coherent introductory narrative.
-        initial_synthesis = self._step3_synthesize_findings(
-            topic, defined_angle, research_points)
+        initial_synthesis = timed(
+            self._step3_synthesize_findings, topic, defined_angle, research_points)
 
         # Step 4: Structure Argument (Simulates Claude-Structure)
         # Organizes the synthesis into a full article structure with section headers.
-        structured_argument = self._step4_structure_argument(
-            topic, initial_synthesis)
+        structured_argument = timed(
+            self._step4_structure_argument, topic, initial_synthesis)
 
         # Step 5: Validate & Generate Counter-Arguments (Simulates Grok/Gemini-Validate)
         # Populates the "Skeptic's View" section with counter-arguments.
-        validated_argument = self._step5_validate_claims(structured_argument)
+        validated_argument = timed(self._step5_validate_claims, structured_argument)
 
         # Step 6: Develop Narrative Scenario (Simulates a creative GPT model)
         # Writes the "Glimpse into the Future" scenario.
-        argument_with_scenario = self._step6_develop_scenario(
-            topic, validated_argument)
+        argument_with_scenario = timed(
+            self._step6_develop_scenario, topic, validated_argument)
 
         # Step 7: Analyze Coherence & Transitions (Simulates Claude-Logic)
         # Refines the connections between paragraphs to improve flow (simulated by a well-structured template).
-        coherent_argument = self._step7_analyze_coherence(
-            argument_with_scenario)
+        coherent_argument = timed(
+            self._step7_analyze_coherence, argument_with_scenario)
 
         # Step 8: Final Polish & Style (Simulates a final GPT model)
         # Adds a concluding paragraph and ensures a consistent, authoritative voice.
-        polished_prose = self._step8_refine_prose(coherent_argument)
+        polished_prose = timed(self._step8_refine_prose, coherent_argument)
 
         # Step 9: Final Formatting (Simulates a formatting utility)
         # Wraps the content with the final title, subtitle, and citation markdown.
-        final_article = self._step9_final_format(topic, polished_prose)
+        final_article = timed(self._step9_final_format, topic, polished_prose)
 
+        if profiler is not None:
+            profiler.record_pipeline(events)
+        return final_article, timings
+
+    async def agenerate_opinion_piece(self, topic: Union[Topic, Dict[str, Any]]) -> str:
+        """
+        Async variant of generate_opinion_piece. Steps without a data dependency on
+        each other run concurrently, so latency follows the critical path
+        (1|2 -> 3 -> 4 -> 5|6 -> 7 -> 8 -> 9) rather than the sum of all nine steps.
+        """
+        final_article, _ = await self._arun_pipeline(Topic.coerce(topic))
         return final_article
 
+    async def _astep(self, step: Callable[..., Any], *args) -> Any:
+        """
+        Async step hook. A subclass can provide `_a<step name>` coroutines
+        (e.g. `_astep2_gather_research`) that call a real model; steps without
+        one fall back to the synchronous simulation.
+        """
+        override = getattr(self, '_a' + step.__name__.lstrip('_'), None)
+        if override is None:
+            if self._backend_for(step.__name__.lstrip('_')) is not None:
+                # Backend calls block on the network; keep them off the event loop.
+                import asyncio
+                return await asyncio.to_thread(self._call_step, step, *args)
+            return self._call_step(step, *args)
+        if self.step_cache is None:
+            return await override(*args)
+
+        key = make_key(override.__name__.lstrip('_'), self.step_version(override), args)
+        found, value = self.step_cache.get(key)
+        if not found:
+            value = await override(*args)
+            self.step_cache.put(key, value)
+        return value
+
+    def _call_step(self, step: Callable[..., Any], *args) -> Any:
+        """Runs a sync step, going through the step cache when one is configured."""
+        if self.step_cache is None:
+            return self._run_step(step, *args)
+        return self.step_cache.call(
+            step.__name__.lstrip('_'), self.step_version(step), partial(self._run_step, step), *args)
+
+    def _backend_for(self, step_name: str) -> Optional["ModelBackend"]:
+        model = self.STEP_MODELS.get(step_name)
+        return self.backends.get(model) if model else None
+
+    def _run_step(self, step: Callable[..., Any], *args) -> Any:
+        """Runs the simulated step, then sends its draft through the step's model backend if any."""
+        draft = step(*args)
+        name = step.__name__.lstrip('_')
+        backend = self._backend_for(name)
+        if backend is None:
+            return draft
+
+        instruction = self.STEP_INSTRUCTIONS[name]
+        if isinstance(draft, str):
+            return backend.generate(f"{instruction}\n\n{draft}", {'step': name, 'draft': draft})
+        if isinstance(draft, list):
+            return backend.generate_batch(
+                [f"{instruction}\n\n{item}" for item in draft],
+                [{'step': name, 'draft': item} for item in draft])
+
+        fields = self.STEP_OUTPUT_FIELDS[name]
+        sections = [getattr(draft, field) for field in fields]
+        refined = backend.generate_batch(
+            [f"{instruction}\n\n{section}" for section in sections],
+            [{'step': name, 'section': field, 'draft': section} for field, section in zip(fields, sections)])
+        return replace(draft, **dict(zip(fields, refined)))
+
+    def step_version(self, step: Callable[..., Any]) -> str:
+        """
+        Cache version of a step: its STEP_VERSIONS entry plus a fingerprint of its code
+        and templates, and for a model-backed step its instruction and backend settings.
+        """
+        fn = getattr(step, '__func__', step)
+        version = self._step_versions.get(fn)
+        if version is None:
+            name = fn.__name__.lstrip('_')
+            if name.startswith('astep'):
+                name = name[1:]
+            version = (f"{self.STEP_VERSIONS.get(name, 1)}:{code_fingerprint(fn)}"
+                       f":{self.templates.fingerprint(name)}")
+            backend = None if fn.__name__.startswith('_astep') else self._backend_for(name)
+            if backend is not None:
+                instruction = hashlib.sha256(self.STEP_INSTRUCTIONS[name].encode('utf-8')).hexdigest()[:16]
+                version += f":{instruction}:{backend.cache_tag}"
+            self._step_versions[fn] = version
+        return version
+
+    def pipeline_version(self) -> str:
+        """Combined version of all nine steps (and any async overrides)."""
+        versions = []
+        for name in self.STEP_VERSIONS:
+            versions.append(self.step_version(getattr(self, '_' + name)))
+            override = getattr(self, '_a' + name, None)
+            if override is not None:
+                versions.append(self.step_version(override))
+        return "|".join(versions)
+
+    def topic_fingerprint(self, topic: Union[Topic, Dict[str, Any]],
+                          pipeline_version: Optional[str] = None) -> str:
+        """Hash of everything a piece depends on: the topic fields and the step versions."""
+        # Hashed as a plain dict so manifests written before Topic existed stay valid.
+        return make_key("opinion_piece", pipeline_version or self.pipeline_version(),
+                        [Topic.coerce(topic).to_dict()])
+
+    async def _arun_pipeline(self, topic: Topic) -> Tuple[str, Dict[str, float]]:
+        """Async counterpart of _run_pipeline; returns the article and per-step wall timings."""
+        import asyncio
+        timings: Dict[str, float] = {}
+        profiler = self.profiler
+        events = []
+
+        async def timed(step, *args):
+            start = time.perf_counter()
+            if profiler is not None:
+                cpu_start = time.thread_time()
+            result = await self._astep(step, *args)
+            elapsed = time.perf_counter() - start
+            timings[step.__name__.lstrip('_')] = elapsed
+            if profiler is not None:
+                events.append(profiler.make_event(
+                    topic.id, step.__name__.lstrip('_'), start, elapsed,
+                    time.thread_time() - cpu_start, result))
+            return result
+
+        # Steps 1 and 2 only need the topic.
+        defined_angle, research_points = await asyncio.gather(
+            timed(self._step1_define_angle, topic),
+            timed(self._step2_gather_research, topic))
+
+        initial_synthesis = await timed(
+            self._step3_synthesize_findings, topic, defined_angle, research_points)
+        structured_argument = await timed(
+            self._step4_structure_argument, topic, initial_synthesis)
+
+        # Steps 5 and 6 fill different sections of the same immutable input;
+        # the two results are merged afterwards.
+        validated_argument, argument_with_scenario = await asyncio.gather(
+            timed(self._step5_validate_claims, structured_argument),
+            timed(self._step6_develop_scenario, topic, structured_argument))
+        merged_argument = replace(
+            structured_argument,
+            skeptic_view=validated_argument.skeptic_view,
+            scenario=argument_with_scenario.scenario)
+
+        coherent_argument = await timed(self._step7_analyze_coherence, merged_argument)
+        polished_prose = await timed(self._step8_refine_prose, coherent_argument)
+        final_article = await timed(self._step9_final_format, topic, polished_prose)
+
+        if profiler is not None:
+            events.sort(key=lambda event: event['start'])
+            profiler.record_pipeline(events)
+        return final_article, timings
+
+    def compute_piece_stats(self, content: str, step_timings: Dict[str, float]) -> Dict[str, Any]:
+        """Stats stage: derives counts and timings from an already generated article."""
+        return {
+            'word_count': len(content.split()),
+            'char_count': len(content),
+            # Body sections are "### " headings; the italic "### *" line is the subtitle.
+            'section_count': sum(1 for line in content.splitlines()
+                                 if line.startswith('### ') and not line.startswith('### *')),
+            'step_timings': step_timings,
+            'total_time': sum(step_timings.values())
+        }
+
     # --- Start of 9-Step Simulation Methods ---
 
-    def _step1_define_angle(self, topic: Dict[str, str]) -> str:
+    def _step1_define_angle(self, topic: Topic) -> str:
         """Simulates a model defining the core angle of the article."""
-        return (
-            f"The conventional wisdom in {topic['domain']} is dangerously outdated, a relic of a simpler time. "
-            f"We're trying to solve tomorrow's problems with yesterday's tools, forcing square pegs into round holes "
-            f"while a revolutionary new paradigm sits right in front of us. The same single-minded focus that the AI "
-            f"world is just now realizing has capped its potential at a mere 76% quality ceiling is the very same "
-            f"thinking that limits our progress in {topic['domain']}. It’s time for a new approach."
-        )
+        return self.templates.render('step1_define_angle', {'domain': topic.domain})
 
-    def _step2_gather_research(self, topic: Dict[str, str]) -> list[str]:
+    def _step2_gather_research(self, topic: Topic) -> list[str]:
         """Simulates a model gathering research points. Returns a list of strings."""
         return [
             "Single, monolithic solutions lead to brittle, inflexible systems that are easily overwhelmed by complexity.",
@@ -188,180 +755,288 @@ class AIPingPongExpertWorkflow:
             "This shift moves value from execution to design, from labor to intellectual leadership."
         ]
 
-    def _step3_synthesize_findings(self, topic: Dict[str, str], angle: str, research: list[str]) -> str:
+    def _step3_synthesize_findings(self, topic: Topic, angle: str, research: list[str]) -> str:
         """Simulates a model synthesizing the angle and research into an introduction."""
-        synthesis = (
-            f"{angle}\n\nThe philosophy of AI Ping-Pong—the art of orchestrating a committee of specialized AI models "
-            f"to achieve a goal no single model can—offers a powerful new lens through which to view the challenges in {topic['domain']}. "
-            f"This isn't about simply adding more technology; it's about fundamentally rethinking our approach to problem-solving.\n\n"
-            f"### The Flaw in Our Current Thinking\n\nFor too long, we have operated under the assumption that a single, monolithic "
-            f"solution—a single strategy, a single platform, a single expert—is the path to success in {topic['domain']}. "
-            f"{research[0]} We see this in the AI world, where single-model approaches lead to context degradation, "
-            f"factual inaccuracies, and a frustrating lack of genuine insight. We are making the exact same mistake.\n\n"
-            f"{research[1]} It's an approach that doesn't scale with the complexity of the real world."
-        )
-        return synthesis
+        return self.templates.render('step3_synthesize_findings', {
+            'angle': angle,
+            'domain': topic.domain,
+            'first_point': research[0],
+            'second_point': research[1]
+        })
 
-    def _step4_structure_argument(self, topic: Dict[str, str], synthesis: str) -> dict:
-        """Simulates a model creating the main sections of the article."""
-        return {
-            "introduction": synthesis,
-            "core_paradigm": (
-                f"### A New Paradigm: The Power of the Committee\n\nHere is the counterintuitive but powerful truth: **{topic['thesis']}**\n\n"
-                "This isn't just a theoretical improvement; it's a paradigm shift. Imagine applying the principles of AI Ping-Pong here. "
-                "Instead of relying on one generalist tool or process, we would orchestrate a workflow of specialists.\n\n"
-                "In this new model, the human's role elevates from a mere operator to a strategic 'workflow orchestrator.' "
-                "The goal is not to perform the task, but to design the system that performs the task. This moves the value from "
-                "execution to design, from labor to intellectual leadership. It’s about having the wisdom to choose the right "
-                "specialists for the job and the skill to make them work together seamlessly."
-            ),
-            "scenario": "### A Glimpse into the Future: A Practical Scenario\n\n[SCENARIO_PLACEHOLDER]",
-            "skeptic_view": "### The Skeptic's View: Acknowledging the Hurdles\n\n[SKEPTIC_PLACEHOLDER]",
-            "implications": (
-                "### The Unseen Implications\n\nThis shift has profound, second-order consequences. It will create new roles and "
-                "render others obsolete. It will demand new skills centered on systems thinking, collaboration, and cross-disciplinary "
-                "expertise. It will force us to develop new ways of measuring quality, moving from simple output metrics to evaluating "
-                "the health and efficiency of the entire orchestrated system.\n\nMost importantly, it will allow us to tackle problems of a "
-                "complexity we previously couldn't imagine. By combining the strengths of diverse, specialized agents—whether they are AI "
-                "models or human experts—we can create a whole that is vastly greater than the sum of its parts."
-            )
-        }
+    def _step4_structure_argument(self, topic: Topic, synthesis: str) -> ArgumentSections:
+        """
+        Simulates a model creating the main sections of the article. The scenario and
+        skeptic sections are left empty for steps 5 and 6 to render in full.
+        """
+        return ArgumentSections(
+            introduction=synthesis,
+            core_paradigm=self.templates.render(
+                'step4_structure_argument.core_paradigm', {'thesis': topic.thesis}),
+            scenario=None,
+            skeptic_view=None,
+            implications=self.templates.render('step4_structure_argument.implications')
+        )
 
-    def _step5_validate_claims(self, argument: dict) -> dict:
+    def _step5_validate_claims(self, argument: ArgumentSections) -> ArgumentSections:
         """Simulates a model generating counter-arguments for the skeptic section."""
-        skeptic_text = (
-            "Of course, this vision is not without its challenges. How do you prevent emergent, unwanted behaviors in such a complex system? "
-            "Who is responsible when an AI committee produces a harmful or nonsensical outcome? And doesn't this create an even more opaque "
-            "'black box' that is harder to audit and understand than a single model?\n\nThese are valid concerns. The answer lies in robust "
-            "human oversight and the development of 'auditor' AIs whose sole job is to monitor the committee's process, flag anomalies, "
-            "and ensure the final output aligns with human values. The complexity is a feature, not a bug, but it requires a new class of "
-            "tools and a new set of skills focused on managing that complexity responsibly. The solution is not to fear the complexity, but "
-            "to build better systems to harness it."
-        )
-        argument["skeptic_view"] = argument["skeptic_view"].replace(
-            "[SKEPTIC_PLACEHOLDER]", skeptic_text)
-        return argument
+        return replace(argument, skeptic_view=self.templates.render('step5_validate_claims.skeptic_view'))
 
-    def _step6_develop_scenario(self, topic: Dict[str, str], argument: dict) -> dict:
+    def _step6_develop_scenario(self, topic: Topic, argument: ArgumentSections) -> ArgumentSections:
         """Simulates a creative model writing a narrative scenario."""
-        scenario_text = (
-            f"Let’s make this concrete. Imagine a team trying to solve a complex challenge in {topic['domain']}. "
-            "In the old paradigm, they would gather in a room and brainstorm, limited by their collective biases and the "
-            "loudest voice in the room.\n\nIn the new paradigm, a human orchestrator assembles their AI committee. "
-            "They task the 'divergent thinking' model with generating a hundred wild ideas. The 'pragmatism' model immediately "
-            "discards 90 for being physically impossible or absurdly expensive. The remaining 10 are passed to a 'systems modeling' "
-            "AI, which maps out their potential second-order consequences. The human orchestrator, observing this high-speed dialectic, "
-            "doesn't just pick the 'best' idea; they identify a novel synthesis of three different ideas that no single participant, "
-            "human or AI, would have conceived of alone. This is the power of orchestrated creativity."
-        )
-        argument["scenario"] = argument["scenario"].replace(
-            "[SCENARIO_PLACEHOLDER]", scenario_text)
-        return argument
-
-    def _step7_analyze_coherence(self, argument: dict) -> str:
-        """Simulates a model assembling the sections into a coherent whole."""
-        return "\n\n".join([
-            argument["introduction"],
-            argument["core_paradigm"],
-            argument["scenario"],
-            argument["skeptic_view"],
-            argument["implications"]
-        ])
-
-    def _step8_refine_prose(self, coherent_prose: str) -> str:
+        return replace(argument, scenario=self.templates.render(
+            'step6_develop_scenario.scenario', {'domain': topic.domain}))
+
+    def _step7_analyze_coherence(self, argument: ArgumentSections) -> list[str]:
+        """
+        Simulates a model putting the sections in reading order. Sections stay
+        separate strings; step 9 joins the whole article exactly once.
+        """
+        return [
+            argument.introduction,
+            argument.core_paradigm,
+            argument.scenario,
+            argument.skeptic_view,
+            argument.implications
+        ]
+
+    def _step8_refine_prose(self, sections: list[str]) -> list[str]:
         """Simulates a final polish of the text and adds a conclusion."""
-        conclusion = (
-            f"\n\n### The Future is Orchestrated\n\nThe debate is over. The pursuit of a single, perfect solution is a dead end. "
-            "The future belongs to the orchestrators—the leaders who can assemble, manage, and guide committees of specialists to "
-            "achieve breakthrough results.\n\nThe principles outlined in the AI Ping-Pong methodology are not just about writing "
-            "better content with AI; they are a blueprint for a new era of problem-solving. The question is no longer *if* this "
-            "shift will happen, but who will have the vision to lead it. Those who continue to cling to the single-model, monolithic "
-            "mindset will be left behind, capped by the same quality and innovation ceilings that an entire industry is now desperately "
-            "trying to escape."
-        )
         # In a real scenario, this step would involve NLP-based stylistic changes. Here, we just append the conclusion.
-        return coherent_prose + conclusion
-
-    def _step9_final_format(self, topic: Dict[str, str], polished_prose: str) -> str:
-        """Wraps the final text with titles and citations."""
-        title = f"# Part {topic['id']}/10: {topic['title']}"
-        subtitle = (
-            f"### *An opinion piece on why the future of {topic['domain'].lower()} depends on embracing the core idea "
-            f"that {topic['thesis'][0].lower() + topic['thesis'][1:]}*"
-        )
-        citation = (
-            '*Inspired by the philosophy of multi-model orchestration in "[AI Ping-Pong: Manual Multi-Model Workflow for 98% '
-            'Content Quality](https://trilogyai.substack.com/p/ai-ping-pong)" by Stanislav Huseletov*'
-        )
-        return f"{title}\n\n{subtitle}\n\n{citation}\n\n{polished_prose}"
+        return sections + [self.templates.render('step8_refine_prose.conclusion')]
+
+    def _step9_final_format(self, topic: Topic, sections: list[str]) -> str:
+        """Wraps the final text with titles and citations, rendering the article in one pass."""
+        header = self.templates.render('step9_final_format.header', {
+            'id': topic.id,
+            'title': topic.title,
+            'domain_lower': topic.domain.lower(),
+            'thesis_sentence': topic.thesis[0].lower() + topic.thesis[1:]
+        })
+        return "\n\n".join([header, *sections])
 
     def _write_final_piece(self, topic: Dict[str, str], thesis: str, domain: str) -> str:
         """DEPRECATED: This method is replaced by the 9-step simulation."""
         pass
 
-    def generate_all_content(self) -> Dict[str, Any]:
-        """Generate all 10 topics and opinion pieces"""
+    def build_piece(self, topic: Topic) -> PieceResult:
+        """Generates one opinion piece and its stats record."""
+        content, step_timings = self._run_pipeline(topic)
+        return self._piece_record(topic, content, step_timings)
 
-        topics = self.generate_tangential_topics()
-        opinion_pieces = {}
+    async def abuild_piece(self, topic: Topic) -> PieceResult:
+        """Async variant of build_piece built on the async pipeline."""
+        content, step_timings = await self._arun_pipeline(topic)
+        return self._piece_record(topic, content, step_timings)
 
-        for topic in topics:
-            opinion_pieces[topic['id']] = {
-                'topic': topic,
-                'content': self.generate_opinion_piece(topic),
-                'word_count': len(self.generate_opinion_piece(topic).split()),
-                'generated_at': datetime.now().isoformat()
-            }
+    def _piece_record(self, topic: Topic, content: str,
+                      step_timings: Dict[str, float]) -> PieceResult:
+        stats = self.compute_piece_stats(content, step_timings)
+        # In a worker process the profiler and step cache are detached copies;
+        # ship their events and counters back with the piece.
+        profile_events = cache_stats = None
+        if self.profiler is not None and self.profiler.detached:
+            profile_events = self.profiler.drain()
+        if self.step_cache is not None and self.step_cache.detached:
+            cache_stats = self.step_cache.drain_stats()
+        return PieceResult(
+            topic_id=topic.id,
+            content=content,
+            word_count=stats['word_count'],
+            char_count=stats['char_count'],
+            section_count=stats['section_count'],
+            step_timings=step_timings,
+            total_time=stats['total_time'],
+            generated_at=datetime.now().isoformat(),
+            profile_events=profile_events,
+            cache_stats=cache_stats
+        )
+
+    def _absorb_worker_state(self, piece: Optional[PieceResult]):
+        """Merges profile events and cache counters shipped back from a worker process."""
+        if piece is None:
+            return
+        if piece.profile_events is not None:
+            self.profiler.absorb(piece.profile_events)
+            piece.profile_events = None
+        if piece.cache_stats is not None:
+            self.step_cache.absorb_stats(piece.cache_stats)
+            piece.cache_stats = None
+
+    def iter_opinion_pieces(self, topics: Optional[Iterable[Union[Topic, Dict[str, Any]]]] = None,
+                            executor: str = "sequential",
+                            max_concurrency: Optional[int] = None
+                            ) -> Iterator[Tuple[Topic, Optional[PieceResult], Optional[str]]]:
+        """Lazily yields (topic, piece, error) per topic, in topic order, as pieces complete."""
+        if topics is None:
+            topics = self.generate_tangential_topics()
+        build = self.abuild_piece if executor == "asyncio" else self.build_piece
+        executor_pool = TopicExecutor(executor, max_concurrency)
+        for topic, piece, error in executor_pool.imap(build, map(Topic.coerce, topics)):
+            self._absorb_worker_state(piece)
+            yield topic, piece, error
+
+    def stream_content(self, topics: Optional[Iterable[Union[Topic, Dict[str, Any]]]] = None,
+                       output_dir: str = "ai_ping_pong_expert_content",
+                       executor: str = "sequential",
+                       max_concurrency: Optional[int] = None,
+                       incremental: bool = False,
+                       manifest_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Streaming counterpart of generate_all_content + save_content. Each piece is
+        written as soon as it finishes; metadata.json and summary.md are built at
+        the end from manifest.jsonl, so nothing is held in memory across topics.
+
+        With incremental=True the existing manifest acts as a checkpoint: topics
+        whose input hash (topic fields + step versions) matches a completed record
+        are skipped, so re-runs and interrupted batches only do the remaining work.
+        Records of topics outside this run are kept, and the totals in
+        metadata.json and summary.md cover the whole manifest.
+
+        A manifest_name (e.g. manifest-shard0.jsonl for a static shard) writes the
+        records there and skips metadata.json and summary.md, which merge_shards()
+        builds once every shard is done. The metadata is still returned.
+        """
+        if topics is None:
+            topics = self.generate_tangential_topics()
+        pipeline_version = self.pipeline_version()
+
+        with StreamingContentWriter(output_dir, incremental, manifest_name) as writer:
+            def dirty_topics():
+                for topic in map(Topic.coerce, topics):
+                    if incremental and writer.is_fresh(
+                            topic.id, self.topic_fingerprint(topic, pipeline_version)):
+                        writer.record_skipped(topic.id)
+                        continue
+                    yield topic
+
+            for topic, piece, error in self.iter_opinion_pieces(dirty_topics(), executor, max_concurrency):
+                if error is None:
+                    writer.write_piece(topic, piece, self.topic_fingerprint(topic, pipeline_version))
+                else:
+                    writer.write_failure(topic, error)
+
+            if incremental:
+                # Dedupe only: the topics may be a subset (a domain, a slice, a shard),
+                # so records of topics outside it are checkpoints to keep.
+                writer.compact()
+
+        # Totals cover the whole output directory, not just this run's topics.
+        totals = writer.totals()
+        metadata = {
+            'total_topics': totals['topics'],
+            'total_pieces': totals['pieces'],
+            'generated_pieces': writer.written,
+            'skipped_pieces': writer.skipped,
+            'failed_pieces': totals['failed'],
+            'total_words': totals['words'],
+            'base_article': self.base_article['title'],
+            'expert_voice': self.expert_voice,
+            'executor': executor,
+            'step_cache': self.step_cache.stats() if self.step_cache else None,
+            'profile': self.profiler.summary() if self.profiler else None,
+            'generated_at': datetime.now().isoformat()
+        }
+        if manifest_name is not None:
+            print(f"Shard records streamed to {writer.manifest_path}")
+            return metadata
+        atomic_write(f"{output_dir}/metadata.json", json.dumps(metadata, indent=2))
+
+        records = writer.iter_manifest(writer.manifest_path)
+        self._write_summary(f"{output_dir}/summary.md",
+                            (record for record in records if record['status'] == 'ok'),
+                            metadata['total_topics'], metadata['total_pieces'])
+
+        print(f"Content streamed to {output_dir}/")
+        return metadata
+
+    def generate_all_content(self, executor: str = "sequential",
+                             max_concurrency: Optional[int] = None,
+                             topics: Optional[Iterable[Union[Topic, Dict[str, Any]]]] = None) -> Dict[str, Any]:
+        """
+        Generate all 10 topics and opinion pieces. opinion_pieces maps topic id to
+        a PieceResult that refers back to its topic by id instead of copying it.
+        """
+
+        if topics is None:
+            topics = self.generate_tangential_topics()
+        topics = [Topic.coerce(topic) for topic in topics]
+        build = self.abuild_piece if executor == "asyncio" else self.build_piece
+        outcomes = TopicExecutor(executor, max_concurrency).map(build, topics)
+
+        opinion_pieces = {}
+        failed_topics = []
+        for topic, (piece, error) in zip(topics, outcomes):
+            self._absorb_worker_state(piece)
+            if error is None:
+                opinion_pieces[topic.id] = piece
+            else:
+                failed_topics.append({'id': topic.id, 'title': topic.title, 'error': error})
 
         return {
             'metadata': {
                 'total_topics': len(topics),
                 'total_pieces': len(opinion_pieces),
+                'failed_pieces': len(failed_topics),
                 'base_article': self.base_article['title'],
                 'expert_voice': self.expert_voice,
+                'executor': executor,
+                'step_cache': self.step_cache.stats() if self.step_cache else None,
+                'profile': self.profiler.summary() if self.profiler else None,
                 'generated_at': datetime.now().isoformat()
             },
             'topics': topics,
-            'opinion_pieces': opinion_pieces
+            'opinion_pieces': opinion_pieces,
+            'failed_topics': failed_topics
         }
 
-    def save_content(self, content: Dict[str, Any], output_dir: str = "ai_ping_pong_expert_content"):
-        """Save all generated content to files"""
+    def save_content(self, content: Dict[str, Any], output_dir: str = "ai_ping_pong_expert_content",
+                     pack: str = "files"):
+        """
+        Save all generated content to files. Every file is written atomically
+        (temp file + rename); pack='tar'|'zip'|'jsonl'|'parquet' puts all pieces
+        into a single opinion_pieces.<pack> file instead of one file per piece.
+        """
 
         os.makedirs(output_dir, exist_ok=True)
 
         # Save metadata
-        with open(f"{output_dir}/metadata.json", 'w') as f:
-            json.dump(content['metadata'], f, indent=2)
+        atomic_write(f"{output_dir}/metadata.json", json.dumps(content['metadata'], indent=2))
 
         # Save topics
-        with open(f"{output_dir}/topics.json", 'w') as f:
-            json.dump(content['topics'], f, indent=2)
+        topics = [Topic.coerce(topic) for topic in content['topics']]
+        atomic_write(f"{output_dir}/topics.json",
+                     json.dumps([topic.to_dict() for topic in topics], indent=2))
 
         # Save individual opinion pieces
-        for piece_id, piece_data in content['opinion_pieces'].items():
-            # Sanitize the title to create a valid filename
-            sanitized_title = piece_data['topic']['title'].replace(' ', '_').replace(
-                ':', '').replace('?', '').replace('/', '').replace('\\', '')
-            filename = f"{output_dir}/opinion_piece_{piece_id:02d}_{sanitized_title[:50]}.md"
-            with open(filename, 'w') as f:
-                f.write(piece_data['content'])
+        titles = {topic.id: topic.title for topic in topics}
+        with BatchWriter(output_dir, pack) as writer:
+            for piece_id, piece_data in content['opinion_pieces'].items():
+                writer.add(piece_filename(piece_id, titles[piece_data.topic_id]), piece_data.content)
 
         # Save summary
-        with open(f"{output_dir}/summary.md", 'w') as f:
-            f.write(f"# AI Ping-Pong Expert Content Summary\n\n")
-            f.write(
-                f"Generated {len(content['topics'])} topics and {len(content['opinion_pieces'])} opinion pieces\n\n")
-            f.write(f"## Topics Generated:\n\n")
-            for topic in content['topics']:
-                f.write(f"{topic['id']}. **{topic['title']}**\n")
-                f.write(f"   - Domain: {topic['domain']}\n")
-                f.write(f"   - Central Question: {topic['question']}\n")
-                f.write(f"   - Core Thesis: {topic['thesis']}\n\n")
+        self._write_summary(f"{output_dir}/summary.md", content['topics'],
+                            len(content['topics']), len(content['opinion_pieces']))
 
         print(f"Content saved to {output_dir}/")
         return output_dir
 
+    def _write_summary(self, path: str, topics: Iterable[Union[Topic, Dict[str, Any]]],
+                       total_topics: int, total_pieces: int):
+        """Writes summary.md; topics may be Topic objects or topic-shaped dicts (e.g. manifest records)."""
+        with atomic_open(path) as f:
+            f.write(
+                f"# AI Ping-Pong Expert Content Summary\n\n"
+                f"Generated {total_topics} topics and {total_pieces} opinion pieces\n\n"
+                f"## Topics Generated:\n\n")
+            # One formatted block per topic into a 1 MB buffer instead of four small writes.
+            f.writelines(
+                f"{topic['id']}. **{topic['title']}**\n"
+                f"   - Domain: {topic['domain']}\n"
+                f"   - Central Question: {topic['question']}\n"
+                f"   - Core Thesis: {topic['thesis']}\n\n"
+                for topic in topics)
+
 
 def main():
     """Main execution function"""
@@ -376,14 +1051,16 @@ def main():
 
     print(f"✅ Generated {len(content['topics'])} new topics")
     print(f"✅ Generated {len(content['opinion_pieces'])} opinion pieces")
+    for failure in content['failed_topics']:
+        print(f"❌ Topic {failure['id']} failed: {failure['error']}")
 
     output_dir = workflow.save_content(content)
 
     print(f"\n📁 All content saved to: {output_dir}/")
     print(
-        f"📊 Total word count: {sum(piece['word_count'] for piece in content['opinion_pieces'].values()):,} words")
+        f"📊 Total word count: {sum(piece.word_count for piece in content['opinion_pieces'].values()):,} words")
     print(
-        f"📈 Average piece length: {sum(piece['word_count'] for piece in content['opinion_pieces'].values()) // len(content['opinion_pieces'])} words")
+        f"📈 Average piece length: {sum(piece.word_count for piece in content['opinion_pieces'].values()) // len(content['opinion_pieces'])} words")
 
     print("\n🎯 Expert Positioning Strategy:")
     print("• Consistent authoritative voice across all pieces")
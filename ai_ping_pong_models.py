@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compact data models for the AI Ping-Pong 9-step pipeline.
+Topics, the intermediate argument of steps 4-7 and per-piece results are
+__slots__ dataclasses instead of dicts, so large batches carry no per-instance
+__dict__ and pieces point at their topic by id rather than holding a copy.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+
+class _Model:
+    """Shared helpers: dict conversion, mapping-style reads and slot-aware pickling."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]):
+        return cls(**{field.name: data[field.name] for field in fields(cls)})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    # Lets code written against the old dict records keep using record['field'].
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    # Frozen slotted instances can't be restored attribute by attribute; rebuild them instead.
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, field.name) for field in fields(self)))
+
+
+@dataclass(frozen=True)
+class Topic(_Model):
+    """One opinion-piece topic, as produced by generate_tangential_topics() or a TopicCatalog."""
+
+    __slots__ = ("id", "title", "domain", "question", "thesis")
+
+    id: int
+    title: str
+    domain: str
+    question: str
+    thesis: str
+
+    @classmethod
+    def coerce(cls, value: Union["Topic", Mapping[str, Any]]) -> "Topic":
+        """Accepts a Topic or a topic dict; a missing question defaults to ''."""
+        if isinstance(value, Topic):
+            return value
+        return cls(value["id"], value["title"], value["domain"],
+                   value.get("question", ""), value["thesis"])
+
+
+@dataclass(frozen=True)
+class ArgumentSections(_Model):
+    """
+    Article sections built by step 4. Steps 5 and 6 fill in skeptic_view and
+    scenario with dataclasses.replace, so each step gets an immutable input.
+    """
+
+    __slots__ = ("introduction", "core_paradigm", "scenario", "skeptic_view", "implications")
+
+    introduction: str
+    core_paradigm: str
+    scenario: Optional[str]
+    skeptic_view: Optional[str]
+    implications: str
+
+
+@dataclass
+class PieceResult(_Model):
+    """
+    One generated piece and its stats. The topic is referenced by topic_id;
+    profile_events and cache_stats carry a worker process's profiler events and
+    step cache counts back, and are cleared once they are absorbed.
+    """
+
+    __slots__ = ("topic_id", "content", "word_count", "char_count", "section_count",
+                 "step_timings", "total_time", "generated_at", "profile_events",
+                 "cache_stats")
+
+    topic_id: int
+    content: str
+    word_count: int
+    char_count: int
+    section_count: int
+    step_timings: Dict[str, float]
+    total_time: float
+    generated_at: str
+    profile_events: Optional[List[Dict[str, Any]]]
+    cache_stats: Optional[Dict[str, int]]
+
+
+_MODELS = {cls.__name__: cls for cls in (Topic, ArgumentSections, PieceResult)}
+
+
+def encode_model(value: Any) -> Any:
+    """json.dumps `default` hook: models become tagged dicts that decode_model turns back."""
+    if isinstance(value, _Model):
+        return {"__model__": type(value).__name__, **value.to_dict()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def decode_model(data: Dict[str, Any]) -> Any:
+    """json.loads `object_hook` counterpart of encode_model."""
+    name = data.get("__model__")
+    if name is None:
+        return data
+    data = dict(data)
+    del data["__model__"]
+    return _MODELS[name].from_dict(data)
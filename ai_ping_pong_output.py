@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Output layer for AI Ping-Pong content: atomic writes, buffered bulk flushing,
+and optional packing of a whole batch into a single archive or JSONL/Parquet file.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+# One pass over the title instead of a chain of str.replace calls.
+_FILENAME_TABLE = str.maketrans({' ': '_', ':': None, '?': None, '/': None, '\\': None})
+
+# mkstemp creates 0600 files; give renamed files the permissions open() would have.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+def sanitize_title(title: str) -> str:
+    return title.translate(_FILENAME_TABLE)
+
+
+def piece_filename(piece_id: Any, title: str) -> str:
+    """Builds the markdown filename for a piece from its id and a sanitized title."""
+    return f"opinion_piece_{piece_id:02d}_{sanitize_title(title)[:50]}.md"
+
+
+@contextlib.contextmanager
+def atomic_open(path: str, mode: str = 'w', buffering: int = 1 << 20,
+                fsync: bool = False) -> Iterator[Any]:
+    """
+    Opens a temp file next to `path` and renames it over `path` only if the block
+    succeeds, so readers never see a half-written file. Text modes use UTF-8.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        os.fchmod(fd, _FILE_MODE)
+        encoding = None if 'b' in mode else 'utf-8'
+        with open(fd, mode, buffering=buffering, encoding=encoding) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def atomic_write(path: str, data: str, fsync: bool = False):
+    with atomic_open(path, fsync=fsync) as f:
+        f.write(data)
+
+
+class BatchWriter:
+    """
+    Buffers named text entries and flushes them in bulk once buffer_bytes is reached.
+
+    pack selects the layout:
+      files    one atomically written file per entry (flushed by io_workers threads,
+               which hides per-file latency on network filesystems)
+      tar/zip  every entry in a single opinion_pieces.tar / .zip
+      jsonl    one {"name", "content"} record per line in opinion_pieces.jsonl
+      parquet  opinion_pieces.parquet with name/content columns (requires pyarrow)
+    Packed outputs are written to a temp file and renamed into place on close().
+    """
+
+    PACK_FORMATS = ('files', 'tar', 'zip', 'jsonl', 'parquet')
+    ARCHIVE_NAME = "opinion_pieces"
+
+    def __init__(self, output_dir: str, pack: str = 'files', buffer_bytes: int = 8 << 20,
+                 io_workers: int = 8, fsync: bool = False):
+        if pack not in self.PACK_FORMATS:
+            raise ValueError(f"Unknown pack format '{pack}'. Choose one of: {', '.join(self.PACK_FORMATS)}")
+        self.output_dir = output_dir
+        self.pack = pack
+        self.buffer_bytes = buffer_bytes
+        self.io_workers = io_workers
+        self.fsync = fsync
+        self.paths: List[str] = []
+        self.bytes_written = 0
+        self._buffer: List[Tuple[str, str]] = []
+        self._buffered = 0
+        self._archive = None
+        self._archive_file = None
+        self._archive_stack: Optional[contextlib.ExitStack] = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, name: str, data: str):
+        self._buffer.append((name, data))
+        self._buffered += len(data)
+        if self._buffered >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        entries, self._buffer, self._buffered = self._buffer, [], 0
+        if self.pack == 'files':
+            self._flush_files(entries)
+        else:
+            self._flush_packed(entries)
+
+    def close(self) -> List[str]:
+        """Flushes what is left and, for packed formats, moves the archive into place."""
+        self.flush()
+        if self._archive_stack is not None:
+            if self._archive is not None:
+                self._archive.close()
+            self._archive_stack.close()
+            self._archive_stack = None
+            path = self._archive_path()
+            self.paths.append(path)
+            self.bytes_written += os.path.getsize(path)
+        return self.paths
+
+    def abort(self):
+        """Drops buffered entries and discards a partially written archive."""
+        self._buffer = []
+        archive, self._archive = self._archive, None
+        if archive is not None:
+            with contextlib.suppress(Exception):
+                archive.close()
+        if self._archive_stack is not None:
+            stack, self._archive_stack = self._archive_stack, None
+            with contextlib.suppress(Exception):
+                stack.__exit__(RuntimeError, RuntimeError("aborted"), None)
+
+    # --- Internal helpers ---
+
+    def _flush_files(self, entries: List[Tuple[str, str]]):
+        def write(entry):
+            name, data = entry
+            path = os.path.join(self.output_dir, name)
+            atomic_write(path, data, self.fsync)
+            return path
+
+        if self.io_workers > 1 and len(entries) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(self.io_workers, len(entries))) as pool:
+                paths = list(pool.map(write, entries))
+        else:
+            paths = [write(entry) for entry in entries]
+        self.paths.extend(paths)
+        self.bytes_written += sum(len(data.encode('utf-8')) for _, data in entries)
+
+    def _archive_path(self) -> str:
+        return os.path.join(self.output_dir, f"{self.ARCHIVE_NAME}.{self.pack}")
+
+    def _open_archive(self):
+        self._archive_stack = contextlib.ExitStack()
+        if self.pack == 'jsonl':
+            self._archive_file = self._archive_stack.enter_context(
+                atomic_open(self._archive_path(), fsync=self.fsync))
+        else:
+            self._archive_file = self._archive_stack.enter_context(
+                atomic_open(self._archive_path(), 'wb', fsync=self.fsync))
+            # Archive modules are only imported for the pack formats that need them.
+            if self.pack == 'tar':
+                import tarfile
+                self._archive = tarfile.open(fileobj=self._archive_file, mode='w')
+            elif self.pack == 'zip':
+                import zipfile
+                self._archive = zipfile.ZipFile(self._archive_file, 'w', zipfile.ZIP_DEFLATED)
+
+    def _flush_packed(self, entries: List[Tuple[str, str]]):
+        if self._archive_stack is None:
+            self._open_archive()
+
+        if self.pack == 'jsonl':
+            self._archive_file.writelines(
+                json.dumps({'name': name, 'content': data}, ensure_ascii=False) + "\n"
+                for name, data in entries)
+        elif self.pack == 'tar':
+            import tarfile
+            now = time.time()
+            for name, data in entries:
+                payload = data.encode('utf-8')
+                info = tarfile.TarInfo(name)
+                info.size = len(payload)
+                info.mtime = now
+                info.mode = _FILE_MODE
+                self._archive.addfile(info, io.BytesIO(payload))
+        elif self.pack == 'zip':
+            for name, data in entries:
+                self._archive.writestr(name, data)
+        else:
+            self._write_parquet(entries)
+
+    def _write_parquet(self, entries: List[Tuple[str, str]]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("pack='parquet' requires pyarrow (pip install pyarrow)") from e
+        table = pa.table({'name': [name for name, _ in entries],
+                          'content': [data for _, data in entries]})
+        if self._archive is None:
+            self._archive = pq.ParquetWriter(self._archive_file, table.schema)
+        # Each flush becomes one row group.
+        self._archive.write_table(table)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Per-step instrumentation for the AI Ping-Pong 9-step pipeline.
+Records wall time, CPU time and output size per step per topic.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Hooks receive one event dict per step (plus one "pipeline" event per topic).
+StepHook = Callable[[Dict[str, Any]], None]
+
+
+def output_size(value: Any) -> int:
+    """Size of a step output in characters; dicts, dataclasses and lists are summed over their items."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(output_size(item) for item in value.values())
+    if is_dataclass(value):
+        return sum(output_size(getattr(value, field.name)) for field in fields(value))
+    if isinstance(value, (list, tuple)):
+        return sum(output_size(item) for item in value)
+    return 0
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class PipelineProfiler:
+    """
+    Collects step events from the workflow and turns them into latency summaries
+    or a Chrome trace (load it in chrome://tracing or Perfetto).
+
+    The workflow only touches the profiler when one is attached, so leaving it
+    out costs a single `is None` check per step. CPU time is per thread, so for
+    async steps it also includes whatever else ran on the event loop meanwhile.
+    """
+
+    def __init__(self, hooks: Optional[List[StepHook]] = None):
+        self.hooks: List[StepHook] = list(hooks or [])
+        self.events: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+        self.detached = False
+        self._outbox: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    # A copy sent to a worker process is "detached": it buffers events so the
+    # workflow can ship them back with the piece instead of losing them.
+    def __getstate__(self):
+        return {'origin': self.origin}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.origin = state['origin']
+        self.detached = True
+
+    def add_hook(self, hook: StepHook):
+        self.hooks.append(hook)
+
+    def make_event(self, topic_id: Any, step: str, start: float, wall: float,
+                   cpu: float, output: Any) -> Dict[str, Any]:
+        return {
+            'topic_id': topic_id,
+            'step': step,
+            'start': start - self.origin,
+            'wall': wall,
+            'cpu': cpu,
+            'output_size': output_size(output),
+            'pid': os.getpid(),
+            'tid': threading.get_ident()
+        }
+
+    def record_pipeline(self, events: List[Dict[str, Any]]):
+        """Records the step events of one topic plus a summary "pipeline" event spanning them."""
+        if not events:
+            return
+        first, last = events[0], max(events, key=lambda event: event['start'] + event['wall'])
+        events = events + [{
+            **first,
+            'step': 'pipeline',
+            'wall': last['start'] + last['wall'] - first['start'],
+            'cpu': sum(event['cpu'] for event in events),
+            'output_size': last['output_size']
+        }]
+        if self.detached:
+            self._outbox.extend(events)
+            return
+        self.absorb(events)
+
+    def absorb(self, events: List[Dict[str, Any]]):
+        """Adds events (including ones shipped back from worker processes) and fires hooks."""
+        with self._lock:
+            self.events.extend(events)
+        for hook in self.hooks:
+            for event in events:
+                hook(event)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Hands back the events buffered by a detached profiler."""
+        events, self._outbox = self._outbox, []
+        return events
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99 wall time (seconds) and totals per step, plus the whole "pipeline"."""
+        by_step = defaultdict(list)
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            by_step[event['step']].append(event)
+
+        summary = {}
+        for step, step_events in by_step.items():
+            walls = sorted(event['wall'] for event in step_events)
+            summary[step] = {
+                'count': len(walls),
+                'mean': sum(walls) / len(walls),
+                'p50': percentile(walls, 50),
+                'p95': percentile(walls, 95),
+                'p99': percentile(walls, 99),
+                'max': walls[-1],
+                'total_wall': sum(walls),
+                'total_cpu': sum(event['cpu'] for event in step_events),
+                'mean_output_size': sum(event['output_size'] for event in step_events) / len(walls)
+            }
+        return summary
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Timeline in the Chrome Trace Event format (complete "X" events, microseconds)."""
+        with self._lock:
+            events = list(self.events)
+        return {
+            'traceEvents': [{
+                'name': event['step'],
+                'cat': 'pipeline' if event['step'] == 'pipeline' else 'step',
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['wall'] * 1e6,
+                'pid': event['pid'],
+                'tid': event['tid'],
+                'args': {
+                    'topic_id': event['topic_id'],
+                    'cpu_ms': event['cpu'] * 1e3,
+                    'output_size': event['output_size']
+                }
+            } for event in events],
+            'displayTimeUnit': 'ms'
+        }
+
+    def write_chrome_trace(self, path: str) -> str:
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
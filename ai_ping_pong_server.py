@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Long-running batch server for the AI Ping-Pong workflow (`ai_ping_pong_cli.py serve`).
+One workflow with its compiled templates, step cache and model connection pools,
+plus any opened topic catalogs, stays warm across batches, so a batch costs
+only its own generation time.
+
+  GET  /health    liveness check
+  GET  /stats     batches served, uptime, step cache stats
+  POST /batch     run one batch; JSON body, every field optional:
+                  topics (catalog path or list of topic objects), format, domain,
+                  offset, limit, output_dir, executor, max_concurrency,
+                  incremental, dry_run
+  POST /shutdown  stop the server
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from ai_ping_pong_catalog import TopicCatalog
+from ai_ping_pong_cli import plan_topics, select_topics
+
+
+class BatchService:
+    """Runs batches against one warm workflow, one batch at a time."""
+
+    def __init__(self, workflow, defaults: Optional[Dict[str, Any]] = None):
+        self.workflow = workflow
+        self.defaults = defaults or {}
+        self.batches = 0
+        self.started = time.time()
+        # Batches may share output directories and the profiler, so they don't overlap.
+        self._lock = threading.Lock()
+        self._catalogs: Dict[Tuple[str, Optional[str]], Tuple[Tuple[int, int], TopicCatalog]] = {}
+
+    def catalog(self, path: str, fmt: Optional[str] = None) -> TopicCatalog:
+        """An open catalog for path, reopened when the file has changed since last use."""
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        cached = self._catalogs.get((path, fmt))
+        if cached is not None:
+            if cached[0] == stamp:
+                return cached[1]
+            cached[1].close()
+        catalog = TopicCatalog(path, fmt)
+        self._catalogs[(path, fmt)] = (stamp, catalog)
+        return catalog
+
+    def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        settings = {**self.defaults, **request}
+        output_dir = settings.get('output_dir') or "ai_ping_pong_expert_content"
+        incremental = bool(settings.get('incremental', False))
+
+        with self._lock:
+            source = settings.get('topics')
+            catalog = self.catalog(source, settings.get('format')) if isinstance(source, str) else None
+            topics = select_topics(self.workflow, source, settings.get('format'), settings.get('domain'),
+                                   settings.get('offset', 0), settings.get('limit'), catalog)
+
+            if settings.get('dry_run'):
+                pending, fresh = plan_topics(self.workflow, topics, output_dir, incremental)
+                return {'dry_run': True, 'pending': [topic.id for topic in pending], 'fresh': fresh}
+
+            metadata = self.workflow.stream_content(
+                topics, output_dir, settings.get('executor', "sequential"),
+                settings.get('max_concurrency'), incremental)
+            self.batches += 1
+            return metadata
+
+    def status(self) -> Dict[str, Any]:
+        step_cache = self.workflow.step_cache
+        return {
+            'status': 'ok',
+            'uptime': time.time() - self.started,
+            'batches': self.batches,
+            'catalogs': sorted(path for path, _ in self._catalogs),
+            'step_cache': step_cache.stats() if step_cache else None
+        }
+
+    def close(self):
+        for _, catalog in self._catalogs.values():
+            catalog.close()
+        self._catalogs.clear()
+
+
+class _BatchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Small JSON replies; don't let Nagle hold them back.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path in ("/health", "/stats"):
+            self._reply(200, self.server.service.status())
+        else:
+            self._reply(404, {"error": "Not found"})
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if path == "/shutdown":
+            self._reply(200, {"status": "shutting down"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if path != "/batch":
+            self._reply(404, {"error": "Not found"})
+            return
+        try:
+            request = json.loads(body) if body.strip() else {}
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            result = self.server.service.run(request)
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            self._reply(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self._reply(200, result)
+
+    def _reply(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(service: BatchService, host: str = "127.0.0.1",
+                 port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Binds the batch server without serving yet; returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), _BatchHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def serve(workflow, host: str = "127.0.0.1", port: int = 3003,
+          defaults: Optional[Dict[str, Any]] = None) -> int:
+    """Serves batches until interrupted or POST /shutdown."""
+    service = BatchService(workflow, defaults)
+    server, base_url = start_server(service, host, port)
+    print(f"🚀 Serving AI Ping-Pong batches on {base_url} (POST /batch, GET /stats, POST /shutdown)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    print(f"👋 Served {service.batches} batches")
+    return 0
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Sharded batch execution for the AI Ping-Pong workflow.
+
+Topics are partitioned across N shards by a stable hash of their id and loaded
+into a SQLite work queue on shared storage. Workers on any machine claim
+batches of their own shard first and steal from other shards when theirs is
+empty. Each worker writes its pieces into the shared output directory, with its
+own manifest-<worker>.jsonl. Static shards (`generate --shard K/N`, no queue)
+write manifest-shard<K>.jsonl instead. merge_shards() then builds the combined
+manifest.jsonl, metadata.json and summary.md from all of them.
+
+SQLite relies on POSIX file locks, so the queue must live on a filesystem where
+those work across machines (e.g. NFSv4 with locking enabled, not an eventually
+consistent object store mount).
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ai_ping_pong_expert_workflow import AIPingPongExpertWorkflow, StreamingContentWriter
+from ai_ping_pong_models import Topic
+from ai_ping_pong_output import atomic_open, atomic_write
+
+
+SHARD_MANIFEST_PREFIX = "manifest-"
+
+
+def shard_for(topic_id: Any, num_shards: int) -> int:
+    """Stable shard number for a topic id; the same on every machine and Python version."""
+    digest = hashlib.blake2b(str(topic_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % num_shards
+
+
+def partition(topics: Iterable[Any], shard: int, num_shards: int) -> Iterator[Topic]:
+    """The topics that belong to one shard, for queue-less static partitioning."""
+    if not 0 <= shard < num_shards:
+        raise ValueError(f"shard must be in 0..{num_shards - 1}, got {shard}")
+    for topic in map(Topic.coerce, topics):
+        if shard_for(topic.id, num_shards) == shard:
+            yield topic
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    SQLite-backed topic queue. A topic id is enqueued at most once. Claims are
+    leases: tasks whose worker died become claimable again once the lease expires,
+    and failed tasks are retried until max_attempts. A task whose lease expires on
+    its last attempt is marked failed rather than handed out again.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            topic_id INTEGER PRIMARY KEY,
+            shard INTEGER NOT NULL,
+            topic TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_until REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS tasks_by_shard ON tasks (shard, status, topic_id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """
+
+    def __init__(self, path: str, timeout: float = 60.0, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode; writes go through _transaction so each one takes the lock once.
+        self._db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        # executescript() would commit on its own; run the statements in one transaction instead.
+        with self._transaction():
+            for statement in self.SCHEMA.split(";"):
+                if statement.strip():
+                    self._db.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two workers can't claim the same rows.
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    @property
+    def num_shards(self) -> Optional[int]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'num_shards'").fetchone()
+        return int(row[0]) if row else None
+
+    def enqueue(self, topics: Iterable[Any], num_shards: int, chunk_size: int = 10000) -> int:
+        """Adds topics that aren't queued yet; returns how many were new."""
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        with self._transaction() as db:
+            current = self.num_shards
+            if current is None:
+                db.execute("INSERT INTO meta (key, value) VALUES ('num_shards', ?)", (str(num_shards),))
+            elif current != num_shards:
+                raise ValueError(f"queue {self.path} is partitioned into {current} shards, not {num_shards}")
+
+        added = 0
+        rows: List[Tuple[int, int, str]] = []
+        for topic in map(Topic.coerce, topics):
+            rows.append((topic.id, shard_for(topic.id, num_shards),
+                         json.dumps(topic.to_dict(), ensure_ascii=False)))
+            if len(rows) >= chunk_size:
+                added += self._insert(rows)
+                rows = []
+        if rows:
+            added += self._insert(rows)
+        return added
+
+    def _insert(self, rows: List[Tuple[int, int, str]]) -> int:
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany("INSERT OR IGNORE INTO tasks (topic_id, shard, topic) VALUES (?, ?, ?)", rows)
+            return db.total_changes - before
+
+    def claim(self, worker: str, shard: Optional[int] = None, limit: int = 16,
+              lease: float = 600.0, steal: bool = True) -> List[Topic]:
+        """
+        Leases up to `limit` claimable tasks to worker: from its own shard if one
+        is given, otherwise (or when that shard is drained and steal is on) from any.
+        """
+        now = time.time()
+        claimable = "(status = 'pending' OR (status = 'claimed' AND lease_until < ?))"
+        with self._transaction() as db:
+            # A topic that keeps killing its worker must not be leased out forever.
+            db.execute(
+                "UPDATE tasks SET status = 'failed', lease_until = NULL, "
+                "error = COALESCE(error, 'lease expired on the last attempt') "
+                "WHERE status = 'claimed' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts))
+            rows = []
+            if shard is not None:
+                rows = db.execute(
+                    f"SELECT topic_id, topic FROM tasks WHERE shard = ? AND {claimable} "
+                    "ORDER BY topic_id LIMIT ?", (shard, now, limit)).fetchall()
+            if not rows and (shard is None or steal):
+                rows = db.execute(
+                    f"SELECT topic_id, topic FROM tasks WHERE {claimable} "
+                    "ORDER BY shard, topic_id LIMIT ?", (now, limit)).fetchall()
+            db.executemany(
+                "UPDATE tasks SET status = 'claimed', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE topic_id = ?",
+                [(worker, now + lease, topic_id) for topic_id, _ in rows])
+        return [Topic.from_dict(json.loads(topic)) for _, topic in rows]
+
+    def finish(self, worker: str, done: Iterable[Any] = (),
+               failed: Iterable[Tuple[Any, str]] = ()):
+        """
+        Records the outcome of a claimed batch. Results for tasks whose lease has
+        passed to another worker are ignored; failures go back to pending until
+        max_attempts is reached.
+        """
+        with self._transaction() as db:
+            db.executemany(
+                "UPDATE tasks SET status = 'done', error = NULL, lease_until = NULL "
+                "WHERE topic_id = ? AND status = 'claimed' AND worker = ?",
+                [(topic_id, worker) for topic_id in done])
+            db.executemany(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_until = NULL WHERE topic_id = ? AND status = 'claimed' AND worker = ?",
+                [(self.max_attempts, error, topic_id, worker) for topic_id, error in failed])
+
+    def release(self, worker: str) -> int:
+        """Returns a worker's unfinished claims to the queue (e.g. on shutdown)."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET status = 'pending', lease_until = NULL, attempts = attempts - 1 "
+                "WHERE status = 'claimed' AND worker = ?", (worker,))
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        counts = {'pending': 0, 'claimed': 0, 'done': 0, 'failed': 0}
+        for status, count in self._db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def shard_counts(self) -> Dict[int, Dict[str, int]]:
+        """Task counts per shard and status."""
+        shards: Dict[int, Dict[str, int]] = {}
+        for shard, status, count in self._db.execute(
+                "SELECT shard, status, COUNT(*) FROM tasks GROUP BY shard, status ORDER BY shard"):
+            shards.setdefault(shard, {})[status] = count
+        return shards
+
+    def close(self):
+        self._db.close()
+
+
+def _manifest_name(worker: str) -> str:
+    return f"{SHARD_MANIFEST_PREFIX}{re.sub(r'[^A-Za-z0-9_.-]', '_', worker)}.jsonl"
+
+
+def static_manifest_name(shard: int) -> str:
+    """Manifest file of static shard K, picked up by merge_shards like a worker's."""
+    return _manifest_name(f"shard{shard}")
+
+
+def run_worker(workflow: AIPingPongExpertWorkflow, queue: WorkQueue, output_dir: str,
+               worker: Optional[str] = None, shard: Optional[int] = None,
+               executor: str = "sequential", max_concurrency: Optional[int] = None,
+               batch_size: int = 16, lease: float = 600.0, steal: bool = True) -> Dict[str, Any]:
+    """
+    Claims and generates batches until the queue has nothing left for this worker.
+    Pieces go to output_dir; this worker's records go to its own shard manifest.
+    """
+    worker = worker or default_worker_id()
+    num_shards = queue.num_shards
+    if shard is not None and (num_shards is None or not 0 <= shard < num_shards):
+        raise ValueError(f"shard must be in 0..{(num_shards or 1) - 1}, got {shard}")
+    pipeline_version = workflow.pipeline_version()
+    batches = 0
+
+    with StreamingContentWriter(output_dir, incremental=True,
+                                manifest_name=_manifest_name(worker)) as writer:
+        try:
+            while True:
+                topics = queue.claim(worker, shard, batch_size, lease, steal)
+                if not topics:
+                    break
+                done, failed = [], []
+                for topic, piece, error in workflow.iter_opinion_pieces(topics, executor, max_concurrency):
+                    if error is None:
+                        writer.write_piece(topic, piece, workflow.topic_fingerprint(topic, pipeline_version))
+                        done.append(topic.id)
+                    else:
+                        writer.write_failure(topic, error)
+                        failed.append((topic.id, error))
+                queue.finish(worker, done, failed)
+                batches += 1
+        finally:
+            queue.release(worker)
+
+    return {
+        'worker': worker,
+        'shard': shard,
+        'batches': batches,
+        'generated_pieces': writer.written,
+        'failed_pieces': writer.failed,
+        'total_words': writer.total_words
+    }
+
+
+def _prefer(record: Dict[str, Any], current: Optional[Dict[str, Any]]) -> bool:
+    """Whether record should replace current: a piece beats a failure, then the newer piece wins."""
+    if current is None:
+        return True
+    if (record['status'] == 'ok') != (current['status'] == 'ok'):
+        return record['status'] == 'ok'
+    return record.get('generated_at', '') >= current.get('generated_at', '')
+
+
+def merge_shards(workflow: AIPingPongExpertWorkflow, output_dir: str,
+                 queue: Optional[WorkQueue] = None) -> Dict[str, Any]:
+    """
+    Combines every manifest-<name>.jsonl in output_dir into manifest.jsonl,
+    metadata.json and summary.md, as a single stream_content run would have written.
+    """
+    paths = sorted(glob.glob(os.path.join(output_dir, f"{SHARD_MANIFEST_PREFIX}*.jsonl")))
+    records: Dict[Any, Dict[str, Any]] = {}
+    shards: Dict[str, Dict[str, int]] = {}
+    for path in paths:
+        shard_records = StreamingContentWriter.load_manifest(path)
+        name = os.path.basename(path)[len(SHARD_MANIFEST_PREFIX):-len(".jsonl")]
+        shards[name] = {'pieces': 0, 'failed': 0}
+        for topic_id, record in shard_records.items():
+            shards[name]['pieces' if record['status'] == 'ok' else 'failed'] += 1
+            if _prefer(record, records.get(topic_id)):
+                records[topic_id] = record
+
+    ordered = [records[topic_id] for topic_id in sorted(records)]
+    pieces = [record for record in ordered if record['status'] == 'ok']
+    with atomic_open(os.path.join(output_dir, StreamingContentWriter.MANIFEST_NAME)) as f:
+        f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in ordered)
+
+    metadata = {
+        'total_topics': len(ordered),
+        'total_pieces': len(pieces),
+        'failed_pieces': len(ordered) - len(pieces),
+        'total_words': sum(record['word_count'] for record in pieces),
+        'base_article': workflow.base_article['title'],
+        'expert_voice': workflow.expert_voice,
+        'shards': shards,
+        'queue': queue.counts() if queue is not None else None,
+        'generated_at': datetime.now().isoformat()
+    }
+    atomic_write(os.path.join(output_dir, "metadata.json"), json.dumps(metadata, indent=2))
+    workflow._write_summary(os.path.join(output_dir, "summary.md"), pieces,
+                            metadata['total_topics'], metadata['total_pieces'])
+    return metadata
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Precompiled text templates for the AI Ping-Pong 9-step pipeline.
+Templates are parsed once into literal and slot parts and rendered in a single
+pass; callers assemble larger documents as part lists joined once at the end.
+"""
+
+import hashlib
+import os
+from string import Formatter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+
+_NO_VALUES: Mapping[str, Any] = MappingProxyType({})
+
+
+class TemplateError(ValueError):
+    """A template could not be parsed or is missing a slot value."""
+
+
+class Template:
+    """
+    A template using str.format-style `{slot}` placeholders (`{{` and `}}` for
+    literal braces). Only bare identifiers are allowed as slots.
+
+    The source is parsed once into literal and slot parts, which are compiled
+    into a single f-string expression, so rendering is one C-level
+    concatenation with no per-call parsing.
+    """
+
+    __slots__ = ("name", "source", "slots", "_render")
+
+    def __init__(self, source: str, name: str = "<template>"):
+        self.name = name
+        self.source = source
+        literals: Dict[str, str] = {}
+        pieces: List[str] = []
+        slots = set()
+        try:
+            parsed = list(Formatter().parse(source))
+        except ValueError as e:
+            raise TemplateError(f"{name}: {e}") from e
+        for literal, field, spec, conversion in parsed:
+            if literal:
+                # Literals are bound as default arguments, so no escaping is needed.
+                literal_name = f"_p{len(literals)}"
+                literals[literal_name] = literal
+                pieces.append("{%s}" % literal_name)
+            if field is not None:
+                if not field.isidentifier() or spec or conversion:
+                    raise TemplateError(f"{name}: unsupported placeholder '{{{field}}}'")
+                slots.add(field)
+                pieces.append("{v[%r]}" % field)
+        self.slots = frozenset(slots)
+
+        parameters = "".join(f", {literal_name}={literal_name}" for literal_name in literals)
+        code = f'def _render(v{parameters}):\n    return f"{"".join(pieces)}"\n'
+        namespace: Dict[str, Any] = dict(literals)
+        exec(compile(code, f"<template {name}>", "exec"), namespace)
+        self._render = namespace["_render"]
+
+    # Compiled functions can't be pickled; recompile from the source instead.
+    def __reduce__(self):
+        return (Template, (self.source, self.name))
+
+    def render(self, values: Mapping[str, Any] = _NO_VALUES) -> str:
+        try:
+            return self._render(values)
+        except KeyError as e:
+            raise TemplateError(f"{self.name}: no value for slot {e}") from None
+
+
+class TemplateSet:
+    """
+    Named templates, by default the built-in step texts. A directory of
+    `<name>.md` files can override or extend them; one trailing newline is
+    stripped from each file so editors that add one don't change the output.
+    """
+
+    EXTENSION = ".md"
+
+    def __init__(self, sources: Optional[Mapping[str, str]] = None):
+        self._templates: Dict[str, Template] = {}
+        # name -> compiled render function, so render() is a single lookup and call.
+        self._renderers: Dict[str, Callable[[Mapping[str, Any]], str]] = {}
+        for name, source in (DEFAULT_TEMPLATES if sources is None else sources).items():
+            self.add(name, source)
+
+    @classmethod
+    def from_directory(cls, directory: str, include_defaults: bool = True) -> "TemplateSet":
+        templates = cls() if include_defaults else cls({})
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(cls.EXTENSION):
+                continue
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+                source = f.read()
+            if source.endswith("\n"):
+                source = source[:-1]
+            templates.add(filename[:-len(cls.EXTENSION)], source)
+        return templates
+
+    def __reduce__(self):
+        return (TemplateSet, ({name: template.source for name, template in self._templates.items()},))
+
+    def add(self, name: str, source: str):
+        template = self._templates[name] = Template(source, name)
+        self._renderers[name] = template._render
+
+    def __getitem__(self, name: str) -> Template:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise TemplateError(f"Unknown template '{name}'") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def names(self) -> List[str]:
+        return sorted(self._templates)
+
+    def render(self, name: str, values: Mapping[str, Any] = _NO_VALUES) -> str:
+        try:
+            return self._renderers[name](values)
+        except KeyError as e:
+            if name not in self._renderers:
+                raise TemplateError(f"Unknown template '{name}'") from None
+            raise TemplateError(f"{name}: no value for slot {e}") from None
+
+    def fingerprint(self, prefix: str = "") -> str:
+        """Hash of every template whose name starts with prefix (used in step cache versions)."""
+        digest = hashlib.sha256()
+        for name in self.names():
+            if name.startswith(prefix):
+                digest.update(name.encode("utf-8") + b"\0" + self._templates[name].source.encode("utf-8") + b"\0")
+        return digest.hexdigest()[:16]
+
+    def write_directory(self, directory: str):
+        """Exports the templates as editable files, e.g. to seed a custom template directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name in self.names():
+            with open(os.path.join(directory, name + self.EXTENSION), "w", encoding="utf-8") as f:
+                f.write(self._templates[name].source + "\n")
+
+
+# Template names are prefixed with the step that renders them, so the step cache
+# can invalidate exactly the steps whose templates changed.
+DEFAULT_TEMPLATES = {
+    "step1_define_angle": (
+        "The conventional wisdom in {domain} is dangerously outdated, a relic of a simpler time. "
+        "We're trying to solve tomorrow's problems with yesterday's tools, forcing square pegs into round holes "
+        "while a revolutionary new paradigm sits right in front of us. The same single-minded focus that the AI "
+        "world is just now realizing has capped its potential at a mere 76% quality ceiling is the very same "
+        "thinking that limits our progress in {domain}. It’s time for a new approach."
+    ),
+    "step3_synthesize_findings": (
+        "{angle}\n\nThe philosophy of AI Ping-Pong—the art of orchestrating a committee of specialized AI models "
+        "to achieve a goal no single model can—offers a powerful new lens through which to view the challenges in {domain}. "
+        "This isn't about simply adding more technology; it's about fundamentally rethinking our approach to problem-solving.\n\n"
+        "### The Flaw in Our Current Thinking\n\nFor too long, we have operated under the assumption that a single, monolithic "
+        "solution—a single strategy, a single platform, a single expert—is the path to success in {domain}. "
+        "{first_point} We see this in the AI world, where single-model approaches lead to context degradation, "
+        "factual inaccuracies, and a frustrating lack of genuine insight. We are making the exact same mistake.\n\n"
+        "{second_point} It's an approach that doesn't scale with the complexity of the real world."
+    ),
+    "step4_structure_argument.core_paradigm": (
+        "### A New Paradigm: The Power of the Committee\n\nHere is the counterintuitive but powerful truth: **{thesis}**\n\n"
+        "This isn't just a theoretical improvement; it's a paradigm shift. Imagine applying the principles of AI Ping-Pong here. "
+        "Instead of relying on one generalist tool or process, we would orchestrate a workflow of specialists.\n\n"
+        "In this new model, the human's role elevates from a mere operator to a strategic 'workflow orchestrator.' "
+        "The goal is not to perform the task, but to design the system that performs the task. This moves the value from "
+        "execution to design, from labor to intellectual leadership. It’s about having the wisdom to choose the right "
+        "specialists for the job and the skill to make them work together seamlessly."
+    ),
+    "step4_structure_argument.implications": (
+        "### The Unseen Implications\n\nThis shift has profound, second-order consequences. It will create new roles and "
+        "render others obsolete. It will demand new skills centered on systems thinking, collaboration, and cross-disciplinary "
+        "expertise. It will force us to develop new ways of measuring quality, moving from simple output metrics to evaluating "
+        "the health and efficiency of the entire orchestrated system.\n\nMost importantly, it will allow us to tackle problems of a "
+        "complexity we previously couldn't imagine. By combining the strengths of diverse, specialized agents—whether they are AI "
+        "models or human experts—we can create a whole that is vastly greater than the sum of its parts."
+    ),
+    "step5_validate_claims.skeptic_view": (
+        "### The Skeptic's View: Acknowledging the Hurdles\n\n"
+        "Of course, this vision is not without its challenges. How do you prevent emergent, unwanted behaviors in such a complex system? "
+        "Who is responsible when an AI committee produces a harmful or nonsensical outcome? And doesn't this create an even more opaque "
+        "'black box' that is harder to audit and understand than a single model?\n\nThese are valid concerns. The answer lies in robust "
+        "human oversight and the development of 'auditor' AIs whose sole job is to monitor the committee's process, flag anomalies, "
+        "and ensure the final output aligns with human values. The complexity is a feature, not a bug, but it requires a new class of "
+        "tools and a new set of skills focused on managing that complexity responsibly. The solution is not to fear the complexity, but "
+        "to build better systems to harness it."
+    ),
+    "step6_develop_scenario.scenario": (
+        "### A Glimpse into the Future: A Practical Scenario\n\n"
+        "Let’s make this concrete. Imagine a team trying to solve a complex challenge in {domain}. "
+        "In the old paradigm, they would gather in a room and brainstorm, limited by their collective biases and the "
+        "loudest voice in the room.\n\nIn the new paradigm, a human orchestrator assembles their AI committee. "
+        "They task the 'divergent thinking' model with generating a hundred wild ideas. The 'pragmatism' model immediately "
+        "discards 90 for being physically impossible or absurdly expensive. The remaining 10 are passed to a 'systems modeling' "
+        "AI, which maps out their potential second-order consequences. The human orchestrator, observing this high-speed dialectic, "
+        "doesn't just pick the 'best' idea; they identify a novel synthesis of three different ideas that no single participant, "
+        "human or AI, would have conceived of alone. This is the power of orchestrated creativity."
+    ),
+    "step8_refine_prose.conclusion": (
+        "### The Future is Orchestrated\n\nThe debate is over. The pursuit of a single, perfect solution is a dead end. "
+        "The future belongs to the orchestrators—the leaders who can assemble, manage, and guide committees of specialists to "
+        "achieve breakthrough results.\n\nThe principles outlined in the AI Ping-Pong methodology are not just about writing "
+        "better content with AI; they are a blueprint for a new era of problem-solving. The question is no longer *if* this "
+        "shift will happen, but who will have the vision to lead it. Those who continue to cling to the single-model, monolithic "
+        "mindset will be left behind, capped by the same quality and innovation ceilings that an entire industry is now desperately "
+        "trying to escape."
+    ),
+    "step9_final_format.header": (
+        "# Part {id}/10: {title}\n\n"
+        "### *An opinion piece on why the future of {domain_lower} depends on embracing the core idea "
+        "that {thesis_sentence}*\n\n"
+        '*Inspired by the philosophy of multi-model orchestration in "[AI Ping-Pong: Manual Multi-Model Workflow for 98% '
+        'Content Quality](https://trilogyai.substack.com/p/ai-ping-pong)" by Stanislav Huseletov*'
+    )
+}
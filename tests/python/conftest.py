@@ -0,0 +1,37 @@
+"""Shared fixtures for the Python workflow tests (run with `python -m pytest tests/python`)."""
+
+import json
+import os
+import sys
+
+import pytest
+
+# The workflow modules live at the repository root rather than in a package.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from ai_ping_pong_expert_workflow import AIPingPongExpertWorkflow  # noqa: E402
+
+DOMAINS = ("Finance & Economics", "Psychology & Self-Help", "Linguistics & Communication")
+
+
+def make_topics(count, start=1):
+    return [{"id": i, "title": f"Topic {i}", "domain": DOMAINS[i % len(DOMAINS)],
+             "question": f"Question {i}?", "thesis": f"thesis number {i}"}
+            for i in range(start, start + count)]
+
+
+def write_jsonl(path, topics):
+    with open(path, "w", encoding="utf-8") as f:
+        for topic in topics:
+            f.write(json.dumps(topic) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def workflow():
+    return AIPingPongExpertWorkflow()
+
+
+@pytest.fixture
+def topics_file(tmp_path):
+    return write_jsonl(tmp_path / "topics.jsonl", make_topics(30))
@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+
+import pytest
+
+from ai_ping_pong_backends import (APIServerBackend, HTTPConnectionPool, RetryableBackendError,
+                                   StubBackend, shared_pool, start_stub_server)
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_stub_server(**kwargs)
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_pool_reuses_keep_alive_connections(stub_server):
+    pool = HTTPConnectionPool(stub_server())
+    for _ in range(5):
+        status, _ = pool.request("POST", "/api/generate", b'{"prompt": "p"}')
+        assert status == 200
+    assert pool.created == 1
+    pool.close()
+
+
+def test_stale_idle_connections_are_replaced_without_a_retry(stub_server):
+    base_url = stub_server(keepalive_timeout=0.2)
+    backend = APIServerBackend("gpt", base_url, retries=0, max_concurrency=4)
+    threads = [threading.Thread(target=backend.generate, args=("p", {"draft": "d"})) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool = shared_pool(base_url)
+    warm = pool.created
+    # Every idle connection is now closed on the server side.
+    time.sleep(0.6)
+
+    started = time.perf_counter()
+    assert backend.generate("p", {"draft": "after idle"}) == "after idle"
+    assert time.perf_counter() - started < 0.2
+    assert pool.created == warm + 1
+    pool.close()
+
+
+def test_unreachable_server_is_retryable():
+    pool = HTTPConnectionPool("http://127.0.0.1:9", timeout=1.0)
+    with pytest.raises(RetryableBackendError):
+        pool.request("POST", "/api/generate", b"{}")
+
+
+def test_retry_with_backoff_then_success():
+    calls = []
+
+    def flaky(prompt, context):
+        calls.append(prompt)
+        if len(calls) < 3:
+            raise RetryableBackendError("HTTP 503")
+        return "ok"
+
+    backend = StubBackend(retries=3, backoff=0.001)
+    backend._generate = flaky
+    assert backend.generate("p") == "ok"
+    assert len(calls) == 3
+
+
+def test_generate_needs_the_session_cookie(stub_server, tmp_path):
+    from ai_ping_pong_backends import BackendError
+    from ai_ping_pong_cli import main as cli_main
+
+    base_url = stub_server(cookie="ai-ping-pong-session=s%3Aabc")
+    with pytest.raises(BackendError, match="401"):
+        APIServerBackend("gpt", base_url, retries=0).generate("p", {"draft": "d"})
+
+    args = ["generate", "--backend", "api", "--api-base", base_url, "--limit", "2"]
+    assert cli_main(args + ["-o", str(tmp_path / "anonymous")]) == 1
+    assert cli_main(args + ["-o", str(tmp_path / "signed-in"), "--api-header", "X-Source: cli",
+                            "--api-cookie", "ai-ping-pong-session=s%3Aabc"]) == 0
+    with open(tmp_path / "signed-in" / "metadata.json", encoding="utf-8") as f:
+        assert json.load(f)['total_pieces'] == 2
@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+import time
+
+from ai_ping_pong_cache import StepCache, code_fingerprint, make_key
+from ai_ping_pong_expert_workflow import AIPingPongExpertWorkflow
+from conftest import make_topics
+
+
+class EditedStep8(AIPingPongExpertWorkflow):
+    def _step8_refine_prose(self, sections):
+        return [section + "\n" for section in super()._step8_refine_prose(sections)]
+
+
+def test_editing_one_step_only_misses_that_step_and_downstream(tmp_path):
+    directory = str(tmp_path / "cache")
+    topics = make_topics(3)
+    original = AIPingPongExpertWorkflow(step_cache=StepCache(directory=directory))
+    original.generate_all_content(topics=topics)
+    assert original.step_cache.stats()['misses'] == 27
+
+    same = AIPingPongExpertWorkflow(step_cache=StepCache(directory=directory))
+    same.generate_all_content(topics=topics)
+    assert same.step_cache.stats()['disk_hits'] == 27
+
+    edited = EditedStep8(step_cache=StepCache(directory=directory))
+    assert edited.step_version(edited._step8_refine_prose) != original.step_version(original._step8_refine_prose)
+    assert edited.step_version(edited._step7_analyze_coherence) == original.step_version(original._step7_analyze_coherence)
+    edited.generate_all_content(topics=topics)
+    stats = edited.step_cache.stats()
+    # Steps 1-7 are unchanged; step 8 is edited and step 9 sees its new output.
+    assert (stats['disk_hits'], stats['misses']) == (21, 6)
+    assert edited.pipeline_version() != original.pipeline_version()
+
+
+def test_code_fingerprint_ignores_string_hash_seed(tmp_path):
+    script = tmp_path / "fingerprint.py"
+    script.write_text(
+        "import sys\n"
+        f"sys.path.insert(0, {os.path.dirname(sys.modules['ai_ping_pong_cache'].__file__)!r})\n"
+        "from ai_ping_pong_cache import code_fingerprint\n"
+        "def step(topic):\n"
+        "    return topic in {'alpha', 'beta', 'gamma', 'delta'}\n"
+        "print(code_fingerprint(step))\n")
+    fingerprints = set()
+    for seed in ("1", "2", "3", "4"):
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        fingerprints.add(subprocess.run([sys.executable, str(script)], env=env, check=True,
+                                        capture_output=True, text=True).stdout)
+    assert len(fingerprints) == 1
+
+
+def test_code_fingerprint_changes_with_constants():
+    def first(topic):
+        return topic + "a"
+
+    def second(topic):
+        return topic + "b"
+
+    assert code_fingerprint(first) != code_fingerprint(second)
+
+
+def test_ttl_expires_entries_in_both_tiers(tmp_path):
+    cache = StepCache(directory=str(tmp_path), ttl=60)
+    key = make_key("step", "1", ["input"])
+    cache.put(key, {"value": 1})
+    assert cache.get(key) == (True, {"value": 1})
+
+    cache.ttl = 0.01
+    time.sleep(0.05)
+    assert cache.get(key) == (False, None)
+    assert cache.stats()['expired'] == 2
+    assert cache.stats()['disk_bytes'] == 0
+
+
+def test_disk_store_evicts_oldest_entries_past_max_bytes(tmp_path):
+    cache = StepCache(directory=str(tmp_path), max_disk_bytes=1000)
+    keys = [make_key("step", "1", [i]) for i in range(10)]
+    for i, key in enumerate(keys):
+        cache.put(key, "x" * 200)
+        path = cache._path(key)
+        os.utime(path, (i, i))
+    assert cache.stats()['disk_bytes'] <= 1000
+
+    cold = StepCache(directory=str(tmp_path))
+    assert cold.get(keys[-1])[0]
+    assert not cold.get(keys[0])[0]
+
+
+def test_process_workers_keep_a_memory_tier_and_report_their_counts():
+    workflow = AIPingPongExpertWorkflow(step_cache=StepCache())
+    topics = make_topics(3)
+    # One worker sees every topic twice: the repeats hit its memory tier.
+    content = workflow.generate_all_content("process", 1, topics + topics)
+    assert content['metadata']['total_pieces'] == 3
+    stats = workflow.step_cache.stats()
+    assert (stats['misses'], stats['hits']) == (27, 27)
+
+
+def test_process_workers_report_disk_growth(tmp_path):
+    workflow = AIPingPongExpertWorkflow(step_cache=StepCache(directory=str(tmp_path)))
+    workflow.generate_all_content("process", 2, make_topics(4))
+    stats = workflow.step_cache.stats()
+    assert stats['misses'] == 36
+    assert stats['disk_bytes'] == StepCache(directory=str(tmp_path)).stats()['disk_bytes'] > 0
+
+
+def test_model_backed_steps_version_their_instruction_and_search_setting():
+    from ai_ping_pong_backends import APIServerBackend
+
+    def workflow(use_search=False, **instructions):
+        backends = {model: APIServerBackend(model, use_search=use_search) for model in ("gpt", "claude")}
+        flow = AIPingPongExpertWorkflow(backends=backends)
+        flow.STEP_INSTRUCTIONS = {**flow.STEP_INSTRUCTIONS, **instructions}
+        return flow
+
+    base = workflow()
+    reworded = workflow(step8_refine_prose="Polish this section.")
+    searching = workflow(use_search=True)
+    assert reworded.step_version(reworded._step8_refine_prose) != base.step_version(base._step8_refine_prose)
+    assert reworded.step_version(reworded._step7_analyze_coherence) == base.step_version(base._step7_analyze_coherence)
+    assert searching.pipeline_version() != base.pipeline_version()
@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from ai_ping_pong_catalog import TopicCatalog
+from conftest import DOMAINS, make_topics, write_jsonl
+
+
+def test_iteration_matches_source_in_every_format(tmp_path):
+    topics = make_topics(12)
+    sources = {
+        "jsonl": write_jsonl(tmp_path / "topics.jsonl", topics),
+        "json": str(tmp_path / "topics.json"),
+        "text": str(tmp_path / "topics.txt"),
+    }
+    with open(sources["json"], "w", encoding="utf-8") as f:
+        json.dump(topics, f, indent=2)
+    with open(sources["text"], "w", encoding="utf-8") as f:
+        f.write("Topics:\n" + "".join(f"{t['id']}. {t['title']}\n" for t in topics))
+
+    for fmt, path in sources.items():
+        with TopicCatalog(path) as catalog:
+            assert catalog.format == fmt
+            assert [topic.id for topic in catalog] == list(range(1, 13))
+            assert catalog.get(7).title == "Topic 7"
+    with TopicCatalog(sources["json"]) as catalog:
+        assert catalog.get(7).to_dict() == topics[6]
+
+
+def test_domain_filter_and_slices(topics_file):
+    with TopicCatalog(topics_file) as catalog:
+        assert catalog.domains() == {domain: 10 for domain in DOMAINS}
+        finance = [topic.id for topic in catalog.filter("Finance & Economics")]
+        assert finance == [i for i in range(1, 31) if i % 3 == 0]
+        assert list(catalog.ids("Finance & Economics")) == finance
+        assert [topic.id for topic in catalog.slice(2, 5, "Finance & Economics")] == finance[2:5]
+        assert [topic.id for topic in catalog.slice(28)] == [29, 30]
+        assert list(catalog.filter("No Such Domain")) == []
+        assert 30 in catalog and 31 not in catalog
+        with pytest.raises(KeyError):
+            catalog.get(31)
+
+
+def test_index_is_rebuilt_when_the_source_changes(tmp_path):
+    path = write_jsonl(tmp_path / "topics.jsonl", make_topics(5))
+    with TopicCatalog(path) as catalog:
+        assert len(catalog) == 5
+    built = os.stat(path + ".idx").st_mtime_ns
+
+    with TopicCatalog(path) as catalog:
+        assert len(catalog) == 5
+    assert os.stat(path + ".idx").st_mtime_ns == built
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": 99, "title": "Late", "domain": "New", "thesis": "t"}) + "\n")
+    with TopicCatalog(path) as catalog:
+        assert len(catalog) == 6
+        assert catalog.get(99).title == "Late"
+        assert [topic.id for topic in catalog.filter("New")] == [99]
+
+
+def test_unsorted_ids_are_looked_up_by_id(tmp_path):
+    path = write_jsonl(tmp_path / "topics.jsonl", list(reversed(make_topics(8))))
+    with TopicCatalog(path) as catalog:
+        assert [topic.id for topic in catalog] == list(range(8, 0, -1))
+        assert list(catalog.ids()) == list(range(1, 9))
+        assert catalog.get(3).thesis == "thesis number 3"
+
+
+def test_close_with_a_live_filter_generator(topics_file):
+    catalog = TopicCatalog(topics_file)
+    domain_topics = catalog.filter("Finance & Economics")
+    sliced = catalog.slice(0, 5, "Finance & Economics")
+    next(domain_topics)
+    next(sliced)
+    catalog.close()
+
+
+def _index_summary(path):
+    with TopicCatalog(path) as catalog:
+        return len(catalog), catalog.domains(), catalog.get(777).title
+
+
+def test_concurrent_builders_share_one_index(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    path = write_jsonl(tmp_path / "topics.jsonl", make_topics(2000))
+    with ProcessPoolExecutor(8) as pool:
+        summaries = list(pool.map(_index_summary, [path] * 32))
+    assert all(summary == summaries[0] for summary in summaries)
+    assert summaries[0][0] == 2000
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_index_falls_back_when_its_directory_is_not_writable(tmp_path, monkeypatch):
+    path = write_jsonl(tmp_path / "topics.jsonl", make_topics(12))
+    # A regular file where a directory should be: nothing can be written under it,
+    # even as root.
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    unwritable = str(blocker / "topics.jsonl.idx")
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    with TopicCatalog(path, index_path=unwritable) as catalog:
+        assert catalog.domains() == {domain: 4 for domain in DOMAINS}
+        assert catalog.get(7).title == "Topic 7"
+    assert len(os.listdir(tmp_path / "cache" / "ai_ping_pong" / "indexes")) == 1
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(blocker))
+    with TopicCatalog(path, index_path=unwritable) as catalog:
+        assert [topic.id for topic in catalog.slice(2, 4, "Finance & Economics")] == [9, 12]
+        assert catalog.get(12).title == "Topic 12"
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_ping_pong_expert_workflow import TopicExecutor
+
+
+def square(item):
+    if item == 3:
+        raise ValueError("bad topic")
+    return item * item
+
+
+@pytest.mark.parametrize("backend", TopicExecutor.BACKENDS)
+def test_map_keeps_order_and_isolates_errors(backend):
+    outcomes = TopicExecutor(backend, 3).map(square, range(10))
+    assert outcomes[3] == (None, "ValueError: bad topic")
+    assert [result for result, _ in outcomes[:3] + outcomes[4:]] == [i * i for i in range(10) if i != 3]
+
+
+def test_amap_awaits_coroutines():
+    async def double(item):
+        await asyncio.sleep(0)
+        return item * 2
+
+    assert asyncio.run(TopicExecutor("asyncio", 2).amap(double, range(4))) == [(0, None), (2, None),
+                                                                              (4, None), (6, None)]
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        TopicExecutor("gpu")
+    with pytest.raises(ValueError):
+        TopicExecutor("thread", 0)
+
+
+@pytest.mark.parametrize("backend", TopicExecutor.BACKENDS)
+def test_imap_keeps_order_and_isolates_errors(backend):
+    outcomes = list(TopicExecutor(backend, 3).imap(square, range(10)))
+    assert [item for item, _, _ in outcomes] == list(range(10))
+    assert outcomes[3] == (3, None, "ValueError: bad topic")
+    assert [result for item, result, _ in outcomes if item != 3] == [i * i for i in range(10) if i != 3]
+
+
+@pytest.mark.parametrize("backend", ("thread", "asyncio"))
+def test_imap_slow_item_does_not_hold_back_later_ones(backend):
+    # One slow item per block of max_concurrency: waiting on whole blocks would
+    # take about 3 * 0.3 s, a sliding window about 2 * 0.3 s.
+    def work(item):
+        time.sleep(0.3 if item % 4 == 0 else 0.01)
+        return item
+
+    async def awork(item):
+        await asyncio.sleep(0.3 if item % 4 == 0 else 0.01)
+        return item
+
+    fn = awork if backend == "asyncio" else work
+    started = time.perf_counter()
+    outcomes = list(TopicExecutor(backend, 4).imap(fn, range(12)))
+    assert [result for _, result, _ in outcomes] == list(range(12))
+    assert time.perf_counter() - started < 0.8
+
+
+def test_asyncio_imap_can_stop_early():
+    async def work(item):
+        await asyncio.sleep(0.01)
+        return item
+
+    outcomes = TopicExecutor("asyncio", 2).imap(work, range(100))
+    assert next(outcomes) == (0, 0, None)
+    outcomes.close()
+
+
+def test_process_imap_builds_the_same_pieces(workflow):
+    from ai_ping_pong_models import Topic
+    from conftest import make_topics
+
+    topics = [Topic.coerce(topic) for topic in make_topics(20)]
+    sequential = [piece.content for _, piece, _ in TopicExecutor("sequential").imap(workflow.build_piece, topics)]
+    outcomes = list(TopicExecutor("process", 2).imap(workflow.build_piece, topics))
+    assert [item for item, _, _ in outcomes] == topics
+    assert [piece.content for _, piece, _ in outcomes] == sequential
+
+
+def test_process_workers_ship_profile_events_back():
+    from ai_ping_pong_expert_workflow import AIPingPongExpertWorkflow
+    from ai_ping_pong_profiling import PipelineProfiler
+    from conftest import make_topics
+
+    workflow = AIPingPongExpertWorkflow(profiler=PipelineProfiler())
+    pieces = list(workflow.iter_opinion_pieces(make_topics(6), "process", 2))
+    assert all(error is None for _, _, error in pieces)
+    # Nine steps plus one pipeline event per topic.
+    assert len(workflow.profiler.events) == 6 * 10
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from ai_ping_pong_cli import plan_topics
+from ai_ping_pong_expert_workflow import StreamingContentWriter
+from ai_ping_pong_models import Topic
+from conftest import make_topics
+
+
+def manifest(output_dir):
+    return StreamingContentWriter.load_manifest(os.path.join(output_dir, "manifest.jsonl"))
+
+
+def metadata(output_dir):
+    with open(os.path.join(output_dir, "metadata.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def interrupted(topics, after):
+    for i, topic in enumerate(topics):
+        if i == after:
+            raise KeyboardInterrupt
+        yield topic
+
+
+def test_resume_after_interrupt_generates_only_the_rest(tmp_path, workflow):
+    output_dir = str(tmp_path / "out")
+    topics = make_topics(10)
+    with pytest.raises(KeyboardInterrupt):
+        workflow.stream_content(interrupted(topics, 4), output_dir)
+    assert sorted(manifest(output_dir)) == [1, 2, 3, 4]
+    # A record torn mid-write by the interrupt.
+    with open(os.path.join(output_dir, "manifest.jsonl"), "a", encoding="utf-8") as f:
+        f.write('{"id": 5, "status": "o')
+
+    result = workflow.stream_content(topics, output_dir, incremental=True)
+    assert (result['generated_pieces'], result['skipped_pieces']) == (6, 4)
+    assert sorted(manifest(output_dir)) == list(range(1, 11))
+    with open(os.path.join(output_dir, "manifest.jsonl"), encoding="utf-8") as f:
+        assert len(f.readlines()) == 10
+
+    again = workflow.stream_content(topics, output_dir, incremental=True)
+    assert (again['generated_pieces'], again['skipped_pieces']) == (0, 10)
+
+
+def test_resume_over_subset_keeps_other_checkpoints(tmp_path, workflow):
+    output_dir = str(tmp_path / "out")
+    topics = make_topics(10)
+    workflow.stream_content(topics, output_dir)
+
+    result = workflow.stream_content(topics[:3], output_dir, incremental=True)
+    assert (result['generated_pieces'], result['skipped_pieces']) == (0, 3)
+    assert sorted(manifest(output_dir)) == list(range(1, 11))
+    assert metadata(output_dir)['total_pieces'] == 10
+
+    pending, fresh = plan_topics(workflow, map(Topic.coerce, topics), output_dir, True)
+    assert (pending, fresh) == ([], 10)
+
+
+def test_changed_topic_or_missing_file_is_regenerated(tmp_path, workflow):
+    output_dir = str(tmp_path / "out")
+    topics = make_topics(5)
+    workflow.stream_content(topics, output_dir)
+
+    topics[1] = {**topics[1], "thesis": "a revised thesis"}
+    os.remove(os.path.join(output_dir, manifest(output_dir)[4]['path']))
+    result = workflow.stream_content(topics, output_dir, incremental=True)
+    assert (result['generated_pieces'], result['skipped_pieces']) == (2, 3)
+
+
+def test_resume_from_another_working_directory(tmp_path, monkeypatch, workflow):
+    monkeypatch.chdir(tmp_path)
+    workflow.stream_content(make_topics(4), "out")
+    assert all(os.sep not in record['path'] for record in manifest("out").values())
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    result = workflow.stream_content(make_topics(4), str(tmp_path / "out"), incremental=True)
+    assert (result['generated_pieces'], result['skipped_pieces']) == (0, 4)
+
+
+def test_non_incremental_run_replaces_manifest(tmp_path, workflow):
+    output_dir = str(tmp_path / "out")
+    workflow.stream_content(make_topics(6), output_dir)
+    workflow.stream_content(make_topics(2), output_dir)
+    assert sorted(manifest(output_dir)) == [1, 2]
+    assert metadata(output_dir)['total_topics'] == 2
@@ -0,0 +1,124 @@
+import json
+import os
+
+import pytest
+
+from ai_ping_pong_cli import main as cli_main
+from ai_ping_pong_expert_workflow import StreamingContentWriter
+from ai_ping_pong_shard import WorkQueue, merge_shards, partition, run_worker, shard_for
+from conftest import make_topics, write_jsonl
+
+
+@pytest.fixture
+def queue(tmp_path):
+    with WorkQueue(str(tmp_path / "queue.db"), max_attempts=2) as queue:
+        yield queue
+
+
+def test_partition_covers_every_topic_once():
+    topics = make_topics(200)
+    shards = [[topic.id for topic in partition(topics, k, 4)] for k in range(4)]
+    assert sorted(sum(shards, [])) == list(range(1, 201))
+    assert all(shards)
+    assert shard_for(17, 4) == shard_for("17", 4)
+
+
+def test_enqueue_dedupes_and_pins_shard_count(queue):
+    assert queue.enqueue(make_topics(20), 3) == 20
+    assert queue.enqueue(make_topics(25), 3) == 5
+    with pytest.raises(ValueError):
+        queue.enqueue(make_topics(1), 4)
+    assert queue.counts()['pending'] == 25
+    assert sum(sum(c.values()) for c in queue.shard_counts().values()) == 25
+
+
+def test_claim_prefers_home_shard_then_steals(queue):
+    queue.enqueue(make_topics(30), 2)
+    home = [topic.id for topic in queue.claim("a", shard=0, limit=100)]
+    assert home and all(shard_for(topic_id, 2) == 0 for topic_id in home)
+
+    assert queue.claim("b", shard=0, limit=100, steal=False) == []
+    stolen = [topic.id for topic in queue.claim("b", shard=0, limit=100)]
+    assert stolen and all(shard_for(topic_id, 2) == 1 for topic_id in stolen)
+    assert sorted(home + stolen) == list(range(1, 31))
+    assert queue.counts() == {'pending': 0, 'claimed': 30, 'done': 0, 'failed': 0}
+
+
+def test_expired_lease_is_reclaimed_and_stale_finish_ignored(queue):
+    queue.enqueue(make_topics(3), 1)
+    claimed = queue.claim("dead", limit=3, lease=-1)
+    assert len(claimed) == 3
+
+    taken = queue.claim("alive", limit=3)
+    assert [topic.id for topic in taken] == [1, 2, 3]
+    # The first worker's results arrive after its lease passed on; they don't count.
+    queue.finish("dead", done=[1, 2, 3])
+    assert queue.counts()['claimed'] == 3
+    queue.finish("alive", done=[1, 2, 3])
+    assert queue.counts()['done'] == 3
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_task(queue):
+    queue.enqueue(make_topics(2), 1)
+    queue.claim("crashes", limit=2, lease=-1)
+    assert len(queue.claim("crashes again", limit=2, lease=-1)) == 2
+    # Both attempts (max_attempts=2) are spent: the queue drains instead of looping.
+    assert queue.claim("next", limit=2) == []
+    assert queue.counts() == {'pending': 0, 'claimed': 0, 'done': 0, 'failed': 2}
+    (error,) = queue._db.execute("SELECT DISTINCT error FROM tasks").fetchone()
+    assert error == "lease expired on the last attempt"
+
+
+def test_release_returns_claims_without_spending_attempts(queue):
+    queue.enqueue(make_topics(4), 1)
+    queue.claim("a", limit=4)
+    assert queue.release("a") == 4
+    assert queue.counts()['pending'] == 4
+    (attempts,) = queue._db.execute("SELECT MAX(attempts) FROM tasks").fetchone()
+    assert attempts == 0
+
+
+def test_failures_retry_until_max_attempts(queue):
+    queue.enqueue(make_topics(1), 1)
+    for expected in ('pending', 'failed'):
+        (topic,) = queue.claim("a")
+        queue.finish("a", failed=[(topic.id, "boom")])
+        assert queue.counts()[expected] == 1
+    assert queue.claim("a") == []
+
+
+def test_workers_drain_queue_and_merge(tmp_path, queue, workflow):
+    output_dir = str(tmp_path / "out")
+    queue.enqueue(make_topics(24), 3)
+    first = run_worker(workflow, queue, output_dir, worker="w1", shard=0, batch_size=4, steal=False)
+    second = run_worker(workflow, queue, output_dir, worker="w2", shard=1, batch_size=4)
+    assert first['generated_pieces'] + second['generated_pieces'] == 24
+    assert queue.counts()['done'] == 24
+
+    metadata = merge_shards(workflow, output_dir, queue)
+    assert set(metadata['shards']) == {"w1", "w2"}
+    assert metadata['total_pieces'] == 24 and metadata['failed_pieces'] == 0
+    records = StreamingContentWriter.load_manifest(os.path.join(output_dir, "manifest.jsonl"))
+    assert sorted(records) == list(range(1, 25))
+    with open(os.path.join(output_dir, "summary.md"), encoding="utf-8") as f:
+        assert "Generated 24 topics and 24 opinion pieces" in f.read()
+
+
+def test_static_shards_share_output_dir_and_merge(tmp_path, capsys):
+    topics = write_jsonl(tmp_path / "topics.jsonl", make_topics(40))
+    output_dir = str(tmp_path / "out")
+    for shard in ("0/2", "1/2"):
+        assert cli_main(["generate", "-t", topics, "--shard", shard, "-o", output_dir]) == 0
+    assert not os.path.exists(os.path.join(output_dir, "manifest.jsonl"))
+    assert not os.path.exists(os.path.join(output_dir, "metadata.json"))
+
+    assert cli_main(["shard", "merge", "-o", output_dir]) == 0
+    assert "Merged 2 shard manifests: 40 pieces" in capsys.readouterr().out
+    with open(os.path.join(output_dir, "metadata.json"), encoding="utf-8") as f:
+        metadata = json.load(f)
+    assert set(metadata['shards']) == {"shard0", "shard1"}
+    assert metadata['total_pieces'] == 40
+
+    # Each shard resumes from its own manifest.
+    assert cli_main(["resume", "-t", topics, "--shard", "1/2", "-o", output_dir, "-n"]) == 0
+    assert "Dry run: 0 topics to generate" in capsys.readouterr().out